@@ -0,0 +1,156 @@
+import queue
+import logging
+import threading
+from typing import Callable, List, Optional
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from config import RETRY_AFTER_SEC
+from metrics import ADMISSION_REJECTED, ADMISSION_IN_FLIGHT, PIPELINE_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_headers(retry_after: int = RETRY_AFTER_SEC):
+    return {"Retry-After": str(retry_after)}
+
+
+def _admit(endpoint: str, slots: threading.BoundedSemaphore) -> bool:
+    if not slots.acquire(blocking=False):
+        ADMISSION_REJECTED.labels(endpoint).inc()
+        return False
+    ADMISSION_IN_FLIGHT.labels(endpoint).inc()
+    return True
+
+
+def _release(endpoint: str, slots: threading.BoundedSemaphore):
+    ADMISSION_IN_FLIGHT.labels(endpoint).dec()
+    slots.release()
+
+
+def concurrency_limit(endpoint: str, limit: int):
+    """FastAPI dependency admitting at most `limit` concurrent requests to an endpoint.
+
+    Requests over the limit get 503 straight away rather than waiting: a waiting sync
+    request would still hold one of the threadpool slots every other endpoint needs.
+    The dependency is async, so the check itself never takes a threadpool slot.
+    Dependencies run after the request body is parsed; for uploads use
+    ConcurrencyLimitMiddleware instead.
+    """
+    slots = threading.BoundedSemaphore(limit) if limit > 0 else None
+
+    async def admit():
+        if slots is None:
+            yield
+            return
+        if not _admit(endpoint, slots):
+            raise HTTPException(status_code=503, detail=f"Too many concurrent {endpoint} requests",
+                                headers=_retry_headers())
+        try:
+            yield
+        finally:
+            _release(endpoint, slots)
+
+    return admit
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware applying the same limit to one route before its body is read.
+
+    FastAPI parses (and spools) a multipart body before resolving dependencies,
+    so a dependency would only reject an upload once it had been received in full.
+    """
+
+    def __init__(self, app, endpoint: str, method: str, path: str, limit: int):
+        self.app = app
+        self.endpoint = endpoint
+        self.method = method
+        self.path = path
+        self.slots = threading.BoundedSemaphore(limit) if limit > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if (self.slots is None or scope["type"] != "http"
+                or scope["method"] != self.method or scope["path"] != self.path):
+            await self.app(scope, receive, send)
+            return
+        if not _admit(self.endpoint, self.slots):
+            response = JSONResponse({"detail": f"Too many concurrent {self.endpoint} requests"},
+                                    status_code=503, headers=_retry_headers())
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _release(self.endpoint, self.slots)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class PipelineQueue:
+    """Bounded FIFO of meeting ids, drained by a fixed number of worker threads.
+
+    Replaces one BackgroundTask per /process call, which ran every requested
+    pipeline at once inside the request threadpool.
+    """
+
+    def __init__(self, run: Callable[[int], object], workers: int, maxsize: int):
+        self._run = run
+        self._workers = max(1, workers)
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue(maxsize=max(0, maxsize))
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def start(self):
+        self._stopping = False
+        for i in range(self._workers):
+            t = threading.Thread(target=self._loop, name=f"pipeline-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        """Stop taking jobs. Running pipelines finish; queued ones are dropped (their meetings stay unprocessed)."""
+        self._stopping = True
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        self._threads = []
+
+    def submit(self, meeting_id: int) -> bool:
+        """Queue a meeting. Returns False if it is already waiting; raises QueueFull when at capacity."""
+        with self._lock:
+            if meeting_id in self._pending:
+                return False
+            try:
+                self._queue.put_nowait(meeting_id)
+            except queue.Full:
+                ADMISSION_REJECTED.labels("process").inc()
+                raise QueueFull()
+            self._pending.add(meeting_id)
+            PIPELINE_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _loop(self):
+        while True:
+            meeting_id = self._queue.get()
+            if meeting_id is None or self._stopping:
+                return
+            with self._lock:
+                self._pending.discard(meeting_id)
+                PIPELINE_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                self._run(meeting_id)
+            except Exception:
+                logger.exception(f"Pipeline worker failed on meeting {meeting_id}")
+
+
+def queue_full_error() -> HTTPException:
+    return HTTPException(status_code=429, detail="Processing queue is full, retry later", headers=_retry_headers())
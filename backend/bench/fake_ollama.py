@@ -0,0 +1,114 @@
+"""Deterministic stand-in for the Ollama HTTP API used by the benchmarks.
+
+Serves `/api/generate` (a fixed STRICT-JSON summary) and `/api/embeddings`
+(a unit vector derived from a hash of the prompt), with optional artificial
+latency so results do not depend on a local GPU or model download.
+
+Run standalone with `python -m bench.fake_ollama --port 11500`.
+"""
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+
+import numpy as np
+
+EMBED_DIM = 768
+
+SUMMARY = {
+    "overview": "Synthetic meeting used for benchmarking.",
+    "key_topics": ["roadmap", "budget", "hiring", "launch"],
+    "decisions": ["Ship the beta next sprint"],
+    "action_items": ["Draft the launch plan"],
+    "risks": ["Budget overrun"],
+    "vibe": "neutral",
+}
+
+
+def fake_embedding(text: str, dim: int = EMBED_DIM) -> list:
+    """Stable pseudo-embedding: same text -> same vector, unrelated texts -> near-orthogonal."""
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    v = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    v /= np.linalg.norm(v) or 1.0
+    return v.tolist()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    generate_latency = 0.0
+    embed_latency = 0.0
+    embed_dim = EMBED_DIM
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, obj, status=200):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/api/generate":
+            time.sleep(self.generate_latency)
+            self._reply({"model": payload.get("model"), "response": json.dumps(SUMMARY), "done": True})
+        elif self.path == "/api/embeddings":
+            time.sleep(self.embed_latency)
+            self._reply({"embedding": fake_embedding(payload.get("prompt", ""), self.embed_dim)})
+        else:
+            self._reply({"error": "not found"}, status=404)
+
+
+class FakeOllama:
+    """Background fake Ollama server. Use as a context manager; `base_url` is ready on enter."""
+
+    def __init__(self, port: int = 0, generate_latency: float = 0.0, embed_latency: float = 0.0,
+                 embed_dim: int = EMBED_DIM):
+        handler = type("Handler", (_Handler,), {
+            "generate_latency": generate_latency,
+            "embed_latency": embed_latency,
+            "embed_dim": embed_dim,
+        })
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Run a fake Ollama server")
+    p.add_argument("--port", type=int, default=11500)
+    p.add_argument("--generate-latency", type=float, default=0.0)
+    p.add_argument("--embed-latency", type=float, default=0.0)
+    args = p.parse_args()
+    srv = FakeOllama(args.port, args.generate_latency, args.embed_latency)
+    print(f"Fake Ollama listening on {srv.base_url}")
+    try:
+        srv.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
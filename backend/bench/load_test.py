@@ -0,0 +1,262 @@
+"""HTTP load harness for the read endpoints.
+
+Drives a weighted mix of `/meetings`, `/meetings/{id}/segments`,
+`/meetings/{id}/summary`, `/meetings/{id}/graph`, `/meetings/{id}/analytics`,
+`/analytics` and `/search` at a fixed
+concurrency (closed loop: each worker sends its next request as soon as the
+previous one returns) and reports latency percentiles, throughput and error
+rates per endpoint. The first request to each endpoint is reported separately
+as "cold" so one-off costs such as client construction stay visible.
+
+    cd backend
+    DATABASE_URL=sqlite:///./bench.db CHROMA_DIR=./bench_chroma python -m bench.seed_corpus
+    python -m bench.load_test --corpus corpus.json --concurrency 16 --duration 60 \\
+        --mix meetings=1,segments=5,summary=3,graph=1,search=2 --out load_results.json
+
+Without `--url` the harness starts `uvicorn main:app` itself against the
+seeded database, with Ollama replaced by the fake server from bench.fake_ollama.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import argparse
+import threading
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from bench.fake_ollama import FakeOllama
+
+DEFAULT_MIX = "meetings=1,segments=5,summary=3,graph=1,search=2"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in RequestFactory.ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r} in mix; choose from {', '.join(RequestFactory.ENDPOINTS)}")
+        try:
+            w = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Bad weight {weight!r} for {name} in mix")
+        if w < 0:
+            raise ValueError(f"Negative weight for {name} in mix")
+        mix.append((name, w))
+    if not any(w > 0 for _, w in mix):
+        raise ValueError("Mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+class RequestFactory:
+    """Builds (endpoint, path, params) tuples against the seeded id range."""
+
+    ENDPOINTS = ("meetings", "segments", "summary", "graph", "analytics", "aggregate", "search")
+
+    def __init__(self, corpus: Dict, seed: int):
+        self.first = corpus["first_meeting_id"]
+        self.last = corpus["last_meeting_id"]
+        self.words = corpus.get("query_words") or ["budget"]
+        self.rng = random.Random(seed)
+
+    def make(self, endpoint: str):
+        mid = self.rng.randint(self.first, self.last)
+        if endpoint == "meetings":
+            return "/meetings", None
+        if endpoint == "segments":
+            return f"/meetings/{mid}/segments", None
+        if endpoint == "summary":
+            return f"/meetings/{mid}/summary", None
+        if endpoint == "graph":
+            return f"/meetings/{mid}/graph", None
+        if endpoint == "analytics":
+            return f"/meetings/{mid}/analytics", None
+        if endpoint == "aggregate":
+            return "/analytics", None
+        if endpoint == "search":
+            return "/search", {"q": " ".join(self.rng.sample(self.words, 3))}
+        raise ValueError(f"Unknown endpoint in mix: {endpoint}")
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.cold: Dict[str, float] = {}
+
+    def record(self, endpoint: str, latency: float, error: Optional[str]):
+        with self.lock:
+            if endpoint not in self.cold:
+                self.cold[endpoint] = latency
+            else:
+                self.latencies[endpoint].append(latency)
+            if error:
+                self.errors[endpoint][error] += 1
+
+
+def _worker(base_url: str, mix: List[Tuple[str, float]], factory_seed: int, corpus: Dict,
+            deadline: float, budget: Optional[List[int]], rec: Recorder, timeout: float):
+    factory = RequestFactory(corpus, factory_seed)
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        if budget is not None:
+            with rec.lock:
+                if budget[0] <= 0:
+                    return
+                budget[0] -= 1
+        endpoint = factory.rng.choices(names, weights)[0]
+        path, params = factory.make(endpoint)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            r = session.get(base_url + path, params=params, timeout=timeout)
+            r.content
+            if r.status_code >= 400:
+                error = str(r.status_code)
+        except requests.RequestException as e:
+            error = type(e).__name__
+        rec.record(endpoint, time.perf_counter() - t0, error)
+
+
+def summarize(rec: Recorder, elapsed: float) -> Dict:
+    out = {}
+    for endpoint in sorted(set(rec.latencies) | set(rec.cold)):
+        lat = np.array(rec.latencies.get(endpoint, []), dtype=float) * 1000
+        count = len(lat) + (1 if endpoint in rec.cold else 0)
+        errors = sum(rec.errors[endpoint].values())
+        entry = {
+            "requests": count,
+            "throughput_rps": count / elapsed if elapsed > 0 else 0.0,
+            "error_rate": errors / count if count else 0.0,
+            "errors": dict(rec.errors[endpoint]),
+            "cold_ms": rec.cold.get(endpoint, 0.0) * 1000,
+        }
+        if len(lat):
+            p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+            entry.update({"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                          "mean_ms": float(lat.mean()), "max_ms": float(lat.max())})
+        out[endpoint] = entry
+    return out
+
+
+def print_summary(result: Dict):
+    print(f"{'endpoint':<10}{'reqs':>8}{'rps':>9}{'err%':>7}{'cold ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint, e in result["endpoints"].items():
+        print(f"{endpoint:<10}{e['requests']:>8}{e['throughput_rps']:>9.1f}{e['error_rate'] * 100:>7.1f}"
+              f"{e['cold_ms']:>9.1f}{e.get('p50_ms', 0):>9.1f}{e.get('p95_ms', 0):>9.1f}{e.get('p99_ms', 0):>9.1f}")
+    print(f"total: {result['total_requests']} requests in {result['elapsed_sec']:.1f}s "
+          f"= {result['throughput_rps']:.1f} req/s at concurrency {result['concurrency']}")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(corpus: Dict, ollama_base: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=corpus["database_url"], CHROMA_DIR=corpus["chroma_dir"],
+               OLLAMA_BASE=ollama_base)
+    if "vector_backend" in corpus:
+        env.update(VECTOR_BACKEND=corpus["vector_backend"], VECTOR_DIR=corpus["vector_dir"])
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        try:
+            requests.get(url + "/openapi.json", timeout=1)
+            return proc, url
+        except requests.RequestException:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("API server did not start within 120s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Load-test the read endpoints against a seeded corpus.")
+    p.add_argument("--corpus", default="corpus.json", help="Manifest written by bench.seed_corpus")
+    p.add_argument("--url", help="Existing API base URL; if omitted a server is started against the corpus")
+    p.add_argument("--server-workers", type=int, default=1, help="uvicorn workers when starting the server")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    p.add_argument("--requests", type=int, help="Stop after this many requests instead of --duration")
+    p.add_argument("--mix", default=DEFAULT_MIX, help="Weighted endpoint mix, e.g. " + DEFAULT_MIX)
+    p.add_argument("--embed-latency", type=float, default=0.0, help="Fake Ollama embedding latency (s)")
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", help="Write results JSON here")
+    args = p.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        p.error(str(e))
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    fake = proc = None
+    base_url = args.url
+    try:
+        if not base_url:
+            fake = FakeOllama(embed_latency=args.embed_latency).start()
+            proc, base_url = start_server(corpus, fake.base_url, args.server_workers)
+
+        rec = Recorder()
+        budget = [args.requests] if args.requests else None
+        deadline = time.perf_counter() + (args.duration if not args.requests else 10**9)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [pool.submit(_worker, base_url, mix, args.seed + i, corpus, deadline, budget, rec, args.timeout)
+                       for i in range(args.concurrency)]
+            # A worker that crashed would otherwise vanish silently and skew the results
+            for fut in futures:
+                fut.result()
+        elapsed = time.perf_counter() - t0
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if fake:
+            fake.stop()
+
+    endpoints = summarize(rec, elapsed)
+    total = sum(e["requests"] for e in endpoints.values())
+    result = {
+        "meta": {"timestamp": datetime.utcnow().isoformat(), "args": vars(args), "corpus": {
+            k: corpus[k] for k in ("first_meeting_id", "last_meeting_id", "segments_per_meeting", "vector_meetings")
+            if k in corpus}},
+        "concurrency": args.concurrency,
+        "elapsed_sec": elapsed,
+        "total_requests": total,
+        "throughput_rps": total / elapsed if elapsed > 0 else 0.0,
+        "endpoints": endpoints,
+    }
+    print_summary(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""Per-stage pipeline benchmark on synthetic meetings.
+
+Generates synthetic multi-speaker audio for each requested length and runs
+the real `pipeline.process_meeting_pipeline` on it, against a fake Ollama
+server and a throwaway database, upload dir, processed dir and vector store.
+Every stage the pipeline times with `pipeline._stage` is also measured here:
+wall time, CPU time (including child processes such as ffmpeg) and peak RSS
+while the stage runs, plus the run's total.
+
+    cd backend
+    python -m bench.pipeline_bench --lengths 1,5,15 --out bench_results.json
+    python -m bench.pipeline_bench --lengths 1,5,15 --compare bench_results.json
+
+Transcription is the only stage replaced: Whisper still runs (and is timed)
+unless --skip-transcription is given, but the stages after it are fed the
+generator's ground-truth script rather than Whisper's output, so their timings
+are comparable between runs.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from bench.fake_ollama import FakeOllama
+from bench.synth import make_meeting
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Non-Linux: fall back to the process-lifetime peak
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class _PeakRSS:
+    """Samples RSS on a background thread; `peak` is the max seen since start()."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.peak = _rss_bytes()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+        return self.peak
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+
+
+@contextmanager
+def measure(name: str, out: Dict[str, Dict]):
+    sampler = _PeakRSS()
+    sampler.start()
+    cpu0, t0 = _cpu_seconds(), time.perf_counter()
+    try:
+        yield
+    finally:
+        out[name] = {
+            "wall_sec": time.perf_counter() - t0,
+            "cpu_sec": _cpu_seconds() - cpu0,
+            "peak_rss_mb": sampler.stop() / 1024**2,
+        }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_length(minutes: float, speakers: int, seed: int, skip_transcription: bool) -> Dict:
+    """Run process_meeting_pipeline on one synthetic meeting, measuring each of its own stages."""
+    import pipeline
+    from config import UPLOAD_DIR
+    from database import get_session
+    from models import Meeting
+
+    duration = minutes * 60.0
+    fname = f"synthetic_{minutes:g}min.wav"
+    src = os.path.join(UPLOAD_DIR, fname)
+    t0 = time.perf_counter()
+    script = make_meeting(src, duration, speakers=speakers, seed=seed)
+    gen_sec = time.perf_counter() - t0
+
+    stages: Dict[str, Dict] = {}
+    pipeline_stage = pipeline._stage
+    transcribe = pipeline.transcribe_with_whisper_cpp
+
+    @contextmanager
+    def measured_stage(name, timings):
+        with measure(name, stages), pipeline_stage(name, timings):
+            yield
+
+    def scripted_transcription(wav_path, output_dir):
+        # Whisper still runs (unless skipped) so it is timed, but later stages get the generator's
+        # ground-truth script, so their timings are comparable between runs
+        if not skip_transcription:
+            transcribe(wav_path, output_dir)
+        return [{"start": x["start"], "end": x["end"], "text": x["text"]} for x in script]
+
+    with get_session() as s:
+        m = Meeting(title=f"synthetic {minutes:g} min", filename=fname)
+        s.add(m); s.commit(); s.refresh(m)
+        meeting_id = m.id
+
+    pipeline._stage = measured_stage
+    pipeline.transcribe_with_whisper_cpp = scripted_transcription
+    try:
+        with measure("total", stages):
+            pipeline.process_meeting_pipeline(meeting_id)
+    finally:
+        pipeline._stage = pipeline_stage
+        pipeline.transcribe_with_whisper_cpp = transcribe
+
+    with get_session() as s:
+        m = s.get(Meeting, meeting_id)
+        if m.status != "completed":
+            raise RuntimeError(f"Pipeline failed on the {minutes:g} min meeting: {m.error_message}")
+    if skip_transcription:
+        stages.pop("transcription", None)
+    return {"minutes": minutes, "audio_sec": duration, "segments": len(script),
+            "generate_sec": gen_sec, "stages": stages}
+
+
+def _stage_names(runs: List[Dict]) -> List[str]:
+    """Stage names in pipeline order, as recorded by the runs themselves."""
+    names: List[str] = []
+    for r in runs:
+        names += [n for n in r["stages"] if n not in names]
+    return names
+
+
+def scaling(runs: List[Dict]) -> Dict[str, Dict]:
+    """Fit wall ~ a * audio^k per stage (log-log least squares) and report k and seconds per audio hour."""
+    out = {}
+    for stage in _stage_names(runs):
+        pts = [(r["audio_sec"], r["stages"][stage]["wall_sec"]) for r in runs if stage in r["stages"]]
+        if not pts:
+            continue
+        x = np.array([p[0] for p in pts])
+        y = np.array([max(p[1], 1e-6) for p in pts])
+        entry = {"sec_per_audio_hour": float(y[-1] / x[-1] * 3600)}
+        if len(pts) >= 2 and len(set(x)) >= 2:
+            entry["exponent"] = float(np.polyfit(np.log(x), np.log(y), 1)[0])
+        out[stage] = entry
+    return out
+
+
+def print_table(result: Dict, baseline: Optional[Dict] = None):
+    base_runs = {r["minutes"]: r for r in (baseline or {}).get("runs", [])}
+    print(f"{'minutes':>8} {'stage':<14}{'wall (s)':>10}{'cpu (s)':>10}{'peak RSS (MB)':>15}" + ("  vs base" if baseline else ""))
+    for r in result["runs"]:
+        for stage in _stage_names([r]):
+            st = r["stages"].get(stage)
+            if not st:
+                continue
+            line = f"{r['minutes']:>8g} {stage:<14}{st['wall_sec']:>10.2f}{st['cpu_sec']:>10.2f}{st['peak_rss_mb']:>15.0f}"
+            prev = base_runs.get(r["minutes"], {}).get("stages", {}).get(stage)
+            if prev and prev["wall_sec"] > 0:
+                line += f"  {st['wall_sec'] / prev['wall_sec']:>6.2f}x"
+            print(line)
+    if result["scaling"]:
+        print()
+        print(f"{'stage':<14}{'s / audio-h':>12}{'exponent':>10}")
+        for stage, sc in result["scaling"].items():
+            exp = f"{sc['exponent']:.2f}" if "exponent" in sc else "-"
+            print(f"{stage:<14}{sc['sec_per_audio_hour']:>12.1f}{exp:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Benchmark each pipeline stage on synthetic meetings.")
+    p.add_argument("--lengths", default="1,5,15", help="Comma-separated meeting lengths in minutes (1 to 180)")
+    p.add_argument("--speakers", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--skip-transcription", action="store_true", help="Skip Whisper (slowest stage) entirely")
+    p.add_argument("--llm-latency", type=float, default=0.0, help="Simulated /api/generate latency (s)")
+    p.add_argument("--embed-latency", type=float, default=0.0, help="Simulated /api/embeddings latency per call (s)")
+    p.add_argument("--out", help="Write results JSON here")
+    p.add_argument("--compare", help="Baseline results JSON to compare wall time against")
+    p.add_argument("--keep", action="store_true", help="Keep the temporary working directory")
+    args = p.parse_args(argv)
+
+    lengths = [float(x) for x in args.lengths.split(",") if x.strip()]
+    if any(l <= 0 or l > 180 for l in lengths):
+        p.error("lengths must be greater than 0 and at most 180 minutes")
+
+    workdir = tempfile.mkdtemp(prefix="pma_bench_")
+    fake = FakeOllama(generate_latency=args.llm_latency, embed_latency=args.embed_latency).start()
+    # Must be set before config is first imported: services read these at import time
+    os.environ["OLLAMA_BASE"] = fake.base_url
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["PROCESSED_DIR"] = os.path.join(workdir, "processed")
+    os.environ["CHROMA_DIR"] = os.path.join(workdir, "chroma")
+    os.environ["VECTOR_DIR"] = os.path.join(workdir, "vectors")
+
+    setup: Dict[str, Dict] = {}
+    runs = []
+    try:
+        with measure("import_services", setup):
+            import pipeline  # noqa: F401  (imports every service; loads the VADER lexicon)
+            from config import UPLOAD_DIR, PROCESSED_DIR
+            from database import init_db
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            os.makedirs(PROCESSED_DIR, exist_ok=True)
+            init_db()
+        if not args.skip_transcription:
+            from services.transcription import get_whisper_model
+            with measure("load_whisper", setup):
+                get_whisper_model()
+
+        for minutes in lengths:
+            print(f"Running {minutes:g} min meeting...", flush=True)
+            runs.append(run_length(minutes, args.speakers, args.seed, args.skip_transcription))
+    finally:
+        fake.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "setup": setup,
+        "runs": runs,
+        "scaling": scaling(runs),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(result, baseline)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Seed a database and Chroma collection with a synthetic meeting corpus for load testing.
+
+    cd backend
+    DATABASE_URL=sqlite:///./bench.db CHROMA_DIR=./bench_chroma \\
+        python -m bench.seed_corpus --meetings 10000 --segments 1000 --vector-meetings 200
+
+Rows go in through bulk INSERTs in batches, including each meeting's analytics
+rollup, so analytics reads never backfill; embeddings are computed locally with
+the same hash-based function the fake Ollama server uses, so `/search` queries
+against the fake server hit the seeded vectors. Set VECTOR_BACKEND/VECTOR_DIR to
+seed the numpy backend instead of Chroma. A `corpus.json` manifest is
+written next to the database for `bench.load_test`.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from bench.fake_ollama import fake_embedding
+from bench.synth import WORDS
+
+TOPICS = ["roadmap", "budget", "hiring", "launch", "pricing", "security", "migration", "support"]
+
+
+def _sqlite_path(url: str) -> Optional[str]:
+    if url.startswith("sqlite:///"):
+        return os.path.abspath(url[len("sqlite:///"):])
+    return None
+
+
+def seed_db(meetings: int, segments: int, batch: int, seed: int):
+    from sqlmodel import insert, select, func
+    from database import init_db, get_session
+    from config import ANALYTICS_WINDOW_SEC
+    from models import Meeting, TranscriptSegment, Summary, Tag, MeetingAnalytics
+    from services.analytics import compute_rollups
+
+    init_db()
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+    now = datetime.utcnow()
+
+    with get_session() as s:
+        first_id = (s.exec(select(func.max(Meeting.id))).one() or 0) + 1
+        for start in range(0, meetings, batch):
+            n = min(batch, meetings - start)
+            ids = list(range(first_id + start, first_id + start + n))
+            s.execute(insert(Meeting), [
+                {"id": mid, "title": f"Synthetic meeting {mid}", "filename": f"synthetic_{mid}.wav",
+                 "created_at": now - timedelta(minutes=mid), "duration_sec": segments * 6.0, "status": "completed"}
+                for mid in ids
+            ])
+            s.execute(insert(Summary), [
+                {"meeting_id": mid, "overview": "Synthetic overview.", "key_topics": json.dumps(TOPICS[:4]),
+                 "decisions": "[]", "action_items": "[]", "risks": "[]", "vibe": "neutral"}
+                for mid in ids
+            ])
+            s.execute(insert(Tag), [{"meeting_id": mid, "name": t} for mid in ids for t in TOPICS[:4]])
+
+            seg_rows, rollup_rows = [], []
+            for mid in ids:
+                lengths = rng.integers(4, 16, size=segments)
+                texts = [" ".join(rng.choice(words, size=int(k))) for k in lengths]
+                sentiments = rng.uniform(-1, 1, size=segments)
+                meeting_segs = [{"meeting_id": mid, "start": j * 6.0, "end": j * 6.0 + 5.5, "text": texts[j],
+                                 "speaker": f"SPEAKER {j % 3 + 1}", "sentiment": float(sentiments[j])}
+                                for j in range(segments)]
+                seg_rows += meeting_segs
+                # Rollups as the pipeline's analytics stage stores them, so reads never backfill
+                r = compute_rollups(meeting_segs, window_sec=ANALYTICS_WINDOW_SEC, duration_sec=segments * 6.0)
+                rollup_rows.append({
+                    "meeting_id": mid, "window_sec": r["window_sec"],
+                    "sentiment_series": json.dumps(r["sentiment_series"], separators=(",", ":")),
+                    "speakers": json.dumps(r["speakers"], separators=(",", ":")),
+                    "total_talk_sec": r["total_talk_sec"], "turn_count": r["turn_count"],
+                    "interruption_count": r["interruption_count"], "mean_sentiment": r["mean_sentiment"],
+                })
+                if len(seg_rows) >= batch * 50:
+                    s.execute(insert(TranscriptSegment), seg_rows)
+                    seg_rows = []
+            if seg_rows:
+                s.execute(insert(TranscriptSegment), seg_rows)
+            s.execute(insert(MeetingAnalytics), rollup_rows)
+            s.commit()
+            print(f"  meetings {start + n}/{meetings}", flush=True)
+    return first_id, first_id + meetings - 1
+
+
+def seed_vectors(first_id: int, last_id: int, limit: int, batch: int):
+    from sqlmodel import select
+    from database import get_session
+    from models import TranscriptSegment
+    from services.vector_store import get_vector_client, LEGACY_COLLECTION
+
+    coll = get_vector_client().get_or_create_collection(name=LEGACY_COLLECTION)
+    last = min(last_id, first_id + limit - 1)
+    with get_session() as s:
+        q = (select(TranscriptSegment.id, TranscriptSegment.meeting_id, TranscriptSegment.text)
+             .where(TranscriptSegment.meeting_id.between(first_id, last))
+             .order_by(TranscriptSegment.id)
+             .execution_options(yield_per=batch))
+        rows = []
+        done = 0
+        for row in s.exec(q):
+            rows.append(row)
+            if len(rows) >= batch:
+                _upsert(coll, rows)
+                done += len(rows)
+                rows = []
+                print(f"  vectors {done}", flush=True)
+        if rows:
+            _upsert(coll, rows)
+
+
+def _upsert(coll, rows):
+    coll.upsert(
+        ids=[f"{mid}:{sid}" for sid, mid, _ in rows],
+        documents=[text for _, _, text in rows],
+        embeddings=[fake_embedding(text) for _, _, text in rows],
+        metadatas=[{"meeting_id": mid, "meeting_title": f"Synthetic meeting {mid}", "segment_id": sid}
+                   for sid, mid, _ in rows],
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Seed a synthetic corpus for load testing.")
+    p.add_argument("--meetings", type=int, default=1000)
+    p.add_argument("--segments", type=int, default=200, help="Segments per meeting")
+    p.add_argument("--vector-meetings", type=int, default=100,
+                   help="How many of the seeded meetings also get Chroma vectors (embedding is the slow part)")
+    p.add_argument("--batch", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+
+    from config import DATABASE_URL, CHROMA_DIR, VECTOR_BACKEND, VECTOR_DIR
+    print(f"Seeding {args.meetings} meetings x {args.segments} segments into {DATABASE_URL}")
+    t0 = time.perf_counter()
+    first_id, last_id = seed_db(args.meetings, args.segments, args.batch, args.seed)
+    db_sec = time.perf_counter() - t0
+
+    print(f"Embedding segments of {min(args.vector_meetings, args.meetings)} meetings into the {VECTOR_BACKEND} store")
+    t0 = time.perf_counter()
+    if args.vector_meetings > 0:
+        seed_vectors(first_id, last_id, args.vector_meetings, batch=5000)
+    vec_sec = time.perf_counter() - t0
+
+    manifest = {
+        "database_url": DATABASE_URL,
+        "chroma_dir": CHROMA_DIR,
+        "vector_backend": VECTOR_BACKEND,
+        "vector_dir": VECTOR_DIR,
+        "first_meeting_id": first_id,
+        "last_meeting_id": last_id,
+        "segments_per_meeting": args.segments,
+        "vector_meetings": min(args.vector_meetings, args.meetings),
+        "query_words": list(WORDS),
+    }
+    db_path = _sqlite_path(DATABASE_URL)
+    manifest_path = os.path.join(os.path.dirname(db_path) if db_path else ".", "corpus.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Done: db {db_sec:.0f}s, vectors {vec_sec:.0f}s, manifest {manifest_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Synthetic multi-speaker meeting generator for benchmarks.
+
+Each speaker is a harmonic "voice" with its own pitch and timbre, amplitude
+modulated at a syllable rate, so the MFCC clustering in diarization sees
+separable speakers. The generated script (start/end/speaker/text per turn)
+doubles as a ground-truth transcript for the stages after Whisper.
+"""
+import wave
+from typing import Dict, List
+
+import numpy as np
+
+WORDS = (
+    "roadmap budget hiring launch customer revenue pipeline deadline quarter review design feedback "
+    "release testing migration database latency onboarding contract pricing forecast sprint backlog "
+    "support escalation partner marketing analytics dashboard security compliance infrastructure "
+    "great concern agree disagree worried happy blocked excellent delay risk progress"
+).split()
+
+# (fundamental Hz, harmonic rolloff) per speaker
+VOICES = [(110.0, 0.55), (190.0, 0.35), (245.0, 0.7), (150.0, 0.45), (210.0, 0.6), (130.0, 0.3)]
+
+
+def make_script(duration_sec: float, speakers: int = 3, seed: int = 0) -> List[Dict]:
+    """Alternating turns of 2-12 s separated by short pauses, ~2.5 words/s."""
+    rng = np.random.default_rng(seed)
+    segs, t, spk = [], 0.0, 0
+    while t < duration_sec:
+        length = float(min(rng.uniform(2.0, 12.0), duration_sec - t))
+        if length < 0.5:
+            break
+        n_words = max(1, int(length * 2.5))
+        text = " ".join(rng.choice(WORDS, size=n_words))
+        segs.append({"start": round(t, 3), "end": round(t + length, 3), "speaker": f"SPEAKER {spk + 1}", "text": text})
+        t += length + float(rng.uniform(0.1, 0.8))
+        if speakers > 1:
+            spk = (spk + int(rng.integers(1, speakers))) % speakers
+    return segs
+
+
+def _voice(n: int, sr: int, speaker_idx: int, rng: np.random.Generator) -> np.ndarray:
+    f0, rolloff = VOICES[speaker_idx % len(VOICES)]
+    t = np.arange(n, dtype=np.float32) / sr
+    f = f0 * (1.0 + 0.03 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 6.28)))
+    phase = 2 * np.pi * np.cumsum(f) / sr
+    y = np.zeros(n, dtype=np.float32)
+    for h in range(1, 8):
+        y += (rolloff ** (h - 1)) * np.sin(h * phase).astype(np.float32)
+    syllables = 0.5 * (1 + np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, 6.28)))
+    return 0.25 * y * syllables.astype(np.float32)
+
+
+def write_meeting_wav(path: str, script: List[Dict], duration_sec: float, sample_rate: int = 44100,
+                      channels: int = 2, seed: int = 0):
+    """Render the script to a 16-bit PCM WAV, one turn at a time to keep memory flat for long meetings."""
+    rng = np.random.default_rng(seed + 1)
+    speaker_idx = {}
+    with wave.open(path, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        cursor = 0
+        total = int(duration_sec * sample_rate)
+
+        def emit(samples: np.ndarray):
+            noise = rng.normal(0, 0.003, size=samples.shape).astype(np.float32)
+            pcm = np.clip((samples + noise) * 32767, -32768, 32767).astype("<i2")
+            if channels > 1:
+                pcm = np.repeat(pcm[:, None], channels, axis=1)
+            w.writeframes(pcm.tobytes())
+
+        for seg in script:
+            start = int(seg["start"] * sample_rate)
+            end = int(seg["end"] * sample_rate)
+            if start > cursor:
+                emit(np.zeros(start - cursor, dtype=np.float32))
+            idx = speaker_idx.setdefault(seg["speaker"], len(speaker_idx))
+            emit(_voice(end - start, sample_rate, idx, rng))
+            cursor = end
+        if total > cursor:
+            emit(np.zeros(total - cursor, dtype=np.float32))
+
+
+def make_meeting(path: str, duration_sec: float, speakers: int = 3, seed: int = 0,
+                 sample_rate: int = 44100, channels: int = 2) -> List[Dict]:
+    """Write a synthetic meeting to `path` and return its ground-truth script."""
+    script = make_script(duration_sec, speakers, seed)
+    write_meeting_wav(path, script, duration_sec, sample_rate, channels, seed)
+    return script
@@ -0,0 +1,190 @@
+"""Compare vector backends on recall, latency and memory.
+
+Builds the same synthetic corpus (clustered, L2-normalised vectors with
+`meeting_id` metadata) in each backend and runs the same queries against it.
+Every backend runs in its own subprocess so RSS figures are not polluted by
+the others. Recall@k is measured against exact float32 brute force.
+
+    cd backend
+    python -m bench.vector_bench --vectors 200000 --dim 768 --queries 200 --out vector_results.json
+
+Backends: chroma, numpy-float32, numpy-float16, numpy-int8 (select with --backends).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_BACKENDS = "chroma,numpy-float32,numpy-float16,numpy-int8"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_dataset(path: str, n: int, dim: int, queries: int, meetings: int, k: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, n // 200), dim)).astype(np.float32)
+    X = centers[rng.integers(0, len(centers), n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    Q = X[rng.integers(0, n, queries)] + 0.2 * rng.standard_normal((queries, dim)).astype(np.float32)
+    Q /= np.linalg.norm(Q, axis=1, keepdims=True)
+    meeting_ids = rng.integers(1, meetings + 1, n)
+    filter_meetings = rng.integers(1, meetings + 1, queries)
+
+    truth = np.empty((queries, k), dtype=np.int64)
+    truth_filtered = []
+    for i in range(queries):
+        scores = X @ Q[i]
+        truth[i] = np.argsort(-scores)[:k]
+        cand = np.flatnonzero(meeting_ids == filter_meetings[i])
+        truth_filtered.append(cand[np.argsort(-scores[cand])[:k]].tolist())
+
+    np.save(os.path.join(path, "X.npy"), X)
+    np.save(os.path.join(path, "Q.npy"), Q)
+    np.save(os.path.join(path, "meeting_ids.npy"), meeting_ids)
+    np.save(os.path.join(path, "filter_meetings.npy"), filter_meetings)
+    np.save(os.path.join(path, "truth.npy"), truth)
+    with open(os.path.join(path, "truth_filtered.json"), "w") as f:
+        json.dump(truth_filtered, f)
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def _peak_rss_mb() -> float:
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1024**2
+
+
+def _open_collection(backend: str, store: str):
+    if backend == "chroma":
+        from services.vector_backends import ChromaBackend
+        return ChromaBackend(store).get_or_create_collection("bench")
+    from services.vector_backends import NumpyBackend
+    return NumpyBackend(store, dtype=backend.split("-", 1)[1]).get_or_create_collection("bench")
+
+
+def run_child(backend: str, data: str, k: int, batch: int) -> Dict:
+    X = np.load(os.path.join(data, "X.npy"), mmap_mode="r")
+    Q = np.load(os.path.join(data, "Q.npy"))
+    meeting_ids = np.load(os.path.join(data, "meeting_ids.npy"))
+    filter_meetings = np.load(os.path.join(data, "filter_meetings.npy"))
+    truth = np.load(os.path.join(data, "truth.npy"))
+    with open(os.path.join(data, "truth_filtered.json")) as f:
+        truth_filtered = json.load(f)
+
+    store = os.path.join(data, f"store_{backend}")
+    rss_start = _rss_mb()
+    coll = _open_collection(backend, store)
+    t0 = time.perf_counter()
+    for i in range(0, len(X), batch):
+        rows = range(i, min(i + batch, len(X)))
+        coll.upsert(ids=[str(r) for r in rows], documents=[""] * len(rows),
+                    embeddings=np.asarray(X[i:i + len(rows)]).tolist(),
+                    metadatas=[{"meeting_id": int(meeting_ids[r])} for r in rows])
+    build_sec = time.perf_counter() - t0
+    del coll
+
+    # Fresh handle, as a restarted API process would see it
+    t0 = time.perf_counter()
+    coll = _open_collection(backend, store)
+    open_sec = time.perf_counter() - t0
+    rss_open = _rss_mb()
+
+    def run(filtered: bool):
+        lat, hits = [], 0
+        for i, q in enumerate(Q):
+            where = {"meeting_id": int(filter_meetings[i])} if filtered else None
+            t = time.perf_counter()
+            res = coll.query(query_embeddings=[q.tolist()], n_results=k, include=["distances", "metadatas"], where=where)
+            lat.append(time.perf_counter() - t)
+            expected = set(truth_filtered[i]) if filtered else set(truth[i].tolist())
+            got = {int(x) for x in res["ids"][0]}
+            hits += len(got & expected) / max(1, len(expected))
+        lat_ms = np.array(lat) * 1000
+        return {"recall_at_k": hits / len(Q), "p50_ms": float(np.percentile(lat_ms, 50)),
+                "p95_ms": float(np.percentile(lat_ms, 95)), "mean_ms": float(lat_ms.mean())}
+
+    result = {
+        "backend": backend,
+        "build_sec": build_sec,
+        "open_sec": open_sec,
+        "query": run(False),
+        "query_filtered": run(True),
+        "rss_start_mb": rss_start,
+        "rss_after_open_mb": rss_open,
+        "rss_after_queries_mb": _rss_mb(),
+        "peak_rss_mb": _peak_rss_mb(),
+        "disk_mb": sum(os.path.getsize(os.path.join(dp, f)) for dp, _, fs in os.walk(store) for f in fs) / 1024**2,
+    }
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Compare vector backends on recall, latency and RSS.")
+    p.add_argument("--vectors", type=int, default=50000)
+    p.add_argument("--dim", type=int, default=768)
+    p.add_argument("--queries", type=int, default=100)
+    p.add_argument("--meetings", type=int, default=200, help="Distinct meeting_id values (for filtered queries)")
+    p.add_argument("--k", type=int, default=8)
+    p.add_argument("--batch", type=int, default=5000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--backends", default=DEFAULT_BACKENDS)
+    p.add_argument("--out", help="Write results JSON here")
+    p.add_argument("--child", help=argparse.SUPPRESS)
+    p.add_argument("--data", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.data, args.k, args.batch)))
+        return 0
+
+    data = tempfile.mkdtemp(prefix="pma_vecbench_")
+    results = []
+    try:
+        print(f"Generating {args.vectors} x {args.dim} vectors and exact top-{args.k} for {args.queries} queries...")
+        make_dataset(data, args.vectors, args.dim, args.queries, args.meetings, args.k, args.seed)
+        for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+            print(f"Running {backend}...", flush=True)
+            proc = subprocess.run(
+                [sys.executable, "-m", "bench.vector_bench", "--child", backend, "--data", data,
+                 "--k", str(args.k), "--batch", str(args.batch)],
+                cwd=BACKEND_DIR, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"  {backend} failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+                results.append({"backend": backend, "error": proc.stderr[-2000:]})
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    finally:
+        shutil.rmtree(data, ignore_errors=True)
+
+    print(f"{'backend':<15}{'build s':>9}{'open s':>8}{'recall':>8}{'p50 ms':>8}{'p95 ms':>8}"
+          f"{'f.recall':>9}{'f.p50 ms':>9}{'RSS MB':>8}{'peak MB':>9}{'disk MB':>9}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<15} failed")
+            continue
+        q, fq = r["query"], r["query_filtered"]
+        print(f"{r['backend']:<15}{r['build_sec']:>9.1f}{r['open_sec']:>8.2f}{q['recall_at_k']:>8.3f}{q['p50_ms']:>8.1f}"
+              f"{q['p95_ms']:>8.1f}{fq['recall_at_k']:>9.3f}{fq['p50_ms']:>9.1f}{r['rss_after_queries_mb']:>8.0f}"
+              f"{r['peak_rss_mb']:>9.0f}{r['disk_mb']:>9.0f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
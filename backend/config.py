@@ -9,10 +9,50 @@ OLLAMA_BASE = os.getenv("OLLAMA_BASE", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
 OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
 
+# Sentiment scoring fans out to a process pool for meetings with at least SENTIMENT_PARALLEL_MIN segments
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(os.cpu_count() or 1)))
+SENTIMENT_PARALLEL_MIN = int(os.getenv("SENTIMENT_PARALLEL_MIN", "2000"))
+
+# Window size (seconds) of the precomputed per-meeting sentiment time series
+ANALYTICS_WINDOW_SEC = float(os.getenv("ANALYTICS_WINDOW_SEC", "30"))
+
+# Segments embedded per checkpoint when rebuilding the vector index
+REINDEX_BATCH_SIZE = int(os.getenv("REINDEX_BATCH_SIZE", "256"))
+
+# Admission control. Endpoints over their concurrency limit answer 503, a full pipeline queue answers 429;
+# both carry Retry-After: RETRY_AFTER_SEC. 0 disables a limit.
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "16"))
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "1"))  # meetings processed at once by the API process
+PIPELINE_QUEUE_MAX = int(os.getenv("PIPELINE_QUEUE_MAX", "32"))  # meetings waiting for a pipeline worker
+RETRY_AFTER_SEC = int(os.getenv("RETRY_AFTER_SEC", "10"))
+# Threads available to blocking vector-store calls made from async endpoints (kept apart from the shared pool)
+VECTOR_QUERY_THREADS = int(os.getenv("VECTOR_QUERY_THREADS", "8"))
+
 CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",") if o.strip()]
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
-UPLOAD_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "uploads"))
-PROCESSED_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "processed"))
-CHROMA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "chroma"))
+UPLOAD_DIR = os.path.abspath(os.getenv("UPLOAD_DIR", os.path.join(os.path.dirname(__file__), "data", "uploads")))
+PROCESSED_DIR = os.path.abspath(os.getenv("PROCESSED_DIR", os.path.join(os.path.dirname(__file__), "data", "processed")))
+CHROMA_DIR = os.path.abspath(os.getenv("CHROMA_DIR", os.path.join(os.path.dirname(__file__), "chroma")))
+
+# Storage lifecycle. Once a meeting completes, its 16 kHz WAV is compressed with AUDIO_ARCHIVE_CODEC
+# (flac, opus or none) and decoded again if a later run needs it.
+AUDIO_ARCHIVE_CODEC = os.getenv("AUDIO_ARCHIVE_CODEC", "flac")
+OPUS_BITRATE = os.getenv("OPUS_BITRATE", "32k")
+
+def _retention_days(name: str, default: str):
+    value = os.getenv(name, default).strip()
+    return float(value) if value else None
+
+# Days to keep intermediates of completed meetings; empty keeps them forever. Uploads are only
+# removed once archived audio exists, so the meeting can still be reprocessed.
+TRANSCRIPT_RETENTION_DAYS = _retention_days("TRANSCRIPT_RETENTION_DAYS", "7")
+UPLOAD_RETENTION_DAYS = _retention_days("UPLOAD_RETENTION_DAYS", "")
+
+# Vector store: "chroma" (default) or "numpy" (memory-mapped matrices under VECTOR_DIR)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+VECTOR_DIR = os.path.abspath(os.getenv("VECTOR_DIR", os.path.join(os.path.dirname(__file__), "vectors")))
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float32")  # float32, float16 or int8
+VECTOR_BLOCK_ROWS = int(os.getenv("VECTOR_BLOCK_ROWS", "8192"))
@@ -1,10 +1,16 @@
 from sqlmodel import SQLModel, create_engine, Session
 from config import DATABASE_URL
 
-engine = create_engine(DATABASE_URL, echo=False)
+# Concurrent writers (API background tasks, batch ingest workers) wait on SQLite's lock instead of failing fast
+connect_args = {"timeout": 30} if DATABASE_URL.startswith("sqlite") else {}
+engine = create_engine(DATABASE_URL, echo=False, connect_args=connect_args)
 
 def init_db():
     SQLModel.metadata.create_all(engine)
+    # create_all skips existing tables, so indexes added to a model later are created here
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
 def get_session():
     return Session(engine)
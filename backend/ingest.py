@@ -0,0 +1,321 @@
+"""Offline batch ingest: register a directory (or manifest) of recordings and
+run the analysis pipeline over them with a process pool.
+
+Usage:
+    python ingest.py /archive/recordings
+    python ingest.py --manifest recordings.tsv --workers 4 --report ingest_report.json
+
+Re-running the same command resumes: recordings whose meeting is already
+`completed` are skipped, everything else (new, failed, or interrupted while
+`processing`) is queued again.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import select
+
+import config
+from config import UPLOAD_DIR, PROCESSED_DIR
+from database import init_db, get_session, engine
+from models import Meeting
+
+logger = logging.getLogger("ingest")
+
+MEDIA_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".aac", ".ogg", ".opus", ".mp4", ".mov", ".avi", ".mkv", ".webm"}
+
+
+def _default_workers() -> int:
+    """One worker per core, capped so each Whisper model copy gets ~2 GB of RAM."""
+    cpus = os.cpu_count() or 1
+    try:
+        mem_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024**3
+        return max(1, min(cpus, int(mem_gb // 2)))
+    except (ValueError, OSError, AttributeError):
+        return cpus
+
+
+def scan_directory(root: str, extensions=MEDIA_EXTENSIONS) -> List[Tuple[str, str]]:
+    """Return (path, title) for every media file under root, sorted for a stable order."""
+    found = []
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in extensions:
+                found.append((os.path.join(dirpath, name), os.path.splitext(name)[0]))
+    return sorted(found)
+
+
+def read_manifest(path: str) -> List[Tuple[str, str]]:
+    """Manifest lines are `path` or `path<TAB>title`; blank lines and `#` comments are ignored."""
+    base = os.path.dirname(os.path.abspath(path))
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            parts = line.split("\t", 1)
+            src = parts[0].strip()
+            if not os.path.isabs(src):
+                src = os.path.join(base, src)
+            title = parts[1].strip() if len(parts) > 1 and parts[1].strip() else os.path.splitext(os.path.basename(src))[0]
+            out.append((src, title))
+    return out
+
+
+def upload_name_for(src: str) -> str:
+    """Deterministic upload filename so the same source always maps to the same Meeting."""
+    digest = hashlib.sha1(os.path.abspath(src).encode("utf-8")).hexdigest()[:12]
+    return f"ingest_{digest}_{os.path.basename(src)}"
+
+
+def _place_upload(src: str, fname: str, copy: bool):
+    """Hard-link (or copy) the source into UPLOAD_DIR; avoids duplicating large archives when possible."""
+    dest = os.path.join(UPLOAD_DIR, fname)
+    if os.path.exists(dest):
+        return
+    if not copy:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+
+
+def register_meetings(items: List[Tuple[str, str]], copy: bool = False, force: bool = False) -> Tuple[List[int], int]:
+    """Create Meeting rows in bulk for items not yet known.
+
+    Returns (meeting ids to process, number skipped because already completed).
+    """
+    by_name: Dict[str, Tuple[str, str]] = {}
+    for src, title in items:
+        by_name.setdefault(upload_name_for(src), (src, title))
+
+    existing: Dict[str, Meeting] = {}
+    names = list(by_name)
+    with get_session() as s:
+        # Chunk the IN clause to stay under SQLite's bound-parameter limit
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            for m in s.exec(select(Meeting).where(Meeting.filename.in_(chunk))).all():
+                existing[m.filename] = m
+
+        todo, skipped, new_rows = [], 0, []
+        for fname, (src, title) in by_name.items():
+            m = existing.get(fname)
+            if m and m.status == "completed" and not force:
+                skipped += 1
+                continue
+            _place_upload(src, fname, copy)
+            if m:
+                if m.status == "processing":
+                    # Left over from an interrupted run; only this run's workers may mark it processing
+                    m.status = "uploaded"
+                    s.add(m)
+                todo.append(m.id)
+            else:
+                new_rows.append(Meeting(title=title, filename=fname))
+
+        s.add_all(new_rows)
+        s.commit()
+        for m in new_rows:
+            s.refresh(m)
+            todo.append(m.id)
+    return todo, skipped
+
+
+def _worker_init():
+    # Forked workers must not reuse the parent's pooled SQLite connections
+    engine.dispose(close=False)
+    # Meetings already run in parallel; don't nest a sentiment pool inside every worker.
+    # Set before services.sentiment is first imported (lazily, via the pipeline).
+    config.SENTIMENT_WORKERS = 1
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(process)d - %(levelname)s - %(message)s")
+
+
+def _run_one(meeting_id: int) -> Dict:
+    from pipeline import process_meeting_pipeline
+
+    t0 = time.perf_counter()
+    timings = process_meeting_pipeline(meeting_id)
+    wall = time.perf_counter() - t0
+    with get_session() as s:
+        m = s.get(Meeting, meeting_id)
+        status = m.status if m else "missing"
+        duration = (m.duration_sec or 0.0) if m else 0.0
+        error = m.error_message if m else None
+    return {"meeting_id": meeting_id, "status": status, "duration_sec": duration,
+            "wall_sec": wall, "timings": timings, "error": error}
+
+
+def _worker_failed(meeting_id: int, error: BaseException) -> Dict:
+    """Result for a meeting whose worker died (e.g. OOM-killed) rather than the pipeline failing."""
+    msg = f"Worker crashed: {type(error).__name__}: {error}"
+    # The pipeline never got to record the failure; don't leave the meeting stuck in `processing`
+    try:
+        with get_session() as s:
+            m = s.get(Meeting, meeting_id)
+            if m and m.status == "processing":
+                m.status = "failed"
+                m.error_message = msg
+                s.add(m)
+                s.commit()
+    except Exception as db_e:
+        logger.error(f"Failed to update meeting {meeting_id}: {str(db_e)}")
+    return {"meeting_id": meeting_id, "status": "failed", "duration_sec": 0.0,
+            "wall_sec": 0.0, "timings": {}, "error": msg}
+
+
+def _run_pool(meeting_ids: List[int], workers: int, results: List[Dict]) -> Tuple[List[int], Optional[BaseException]]:
+    """Run meetings on a fresh pool, appending to `results`.
+
+    Returns the meetings left unfinished because a worker died (which breaks the
+    whole pool), with the error, or ([], None) when every meeting finished.
+    """
+    pool = ProcessPoolExecutor(max_workers=max(1, workers), initializer=_worker_init)
+    try:
+        futures = {pool.submit(_run_one, mid): mid for mid in meeting_ids}
+        for fut in as_completed(futures):
+            try:
+                r = fut.result()
+            except BrokenProcessPool as e:
+                pool.shutdown(wait=True)
+                done = {r["meeting_id"] for r in results}
+                return [mid for mid in meeting_ids if mid not in done], e
+            except Exception as e:
+                r = _worker_failed(futures[fut], e)
+            results.append(r)
+            logger.info(f"[{len(results)}] meeting {r['meeting_id']}: {r['status']} "
+                        f"({r['duration_sec']:.0f}s audio in {r['wall_sec']:.0f}s)")
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return [], None
+
+
+def _started(meeting_ids: List[int]) -> List[int]:
+    """The meetings a worker had picked up, i.e. those its pipeline marked `processing`."""
+    with get_session() as s:
+        return list(s.exec(select(Meeting.id).where(Meeting.id.in_(meeting_ids),
+                                                    Meeting.status == "processing")).all())
+
+
+def run_batch(todo: List[int], workers: int, results: List[Dict]):
+    """Process `todo`, surviving workers that die (e.g. OOM-killed on a very long recording).
+
+    A dead worker breaks the pool and every meeting still outstanding with it. Meetings
+    that had not started go to a new pool; those that were running are retried one at
+    a time afterwards, so only a recording that crashes a worker on its own is failed.
+    """
+    pending, suspects = list(todo), []
+    while pending:
+        unfinished, error = _run_pool(pending, workers, results)
+        if not unfinished:
+            break
+        started = _started(unfinished)
+        if not started:
+            # Workers die before taking any meeting (e.g. in the initializer); a new pool won't help
+            results.extend(_worker_failed(mid, error) for mid in unfinished)
+            break
+        logger.warning(f"A worker died; retrying {len(started)} running meeting(s) one at a time later")
+        suspects += started
+        pending = [mid for mid in unfinished if mid not in started]
+
+    for mid in suspects:
+        unfinished, error = _run_pool([mid], 1, results)
+        if unfinished:
+            r = _worker_failed(mid, error)
+            results.append(r)
+            logger.info(f"[{len(results)}] meeting {mid}: {r['error']}")
+
+
+def build_report(results: List[Dict], wall_sec: float, workers: int, skipped: int) -> Dict:
+    audio_sec = sum(r["duration_sec"] for r in results if r["status"] == "completed")
+    stage_totals: Dict[str, float] = {}
+    for r in results:
+        for stage, sec in r["timings"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + sec
+    busy = sum(stage_totals.values()) or 1.0
+    n = len(results) or 1
+    return {
+        "workers": workers,
+        "processed": len(results),
+        "completed": sum(1 for r in results if r["status"] == "completed"),
+        "failed": sum(1 for r in results if r["status"] != "completed"),
+        "skipped": skipped,
+        "wall_sec": wall_sec,
+        "audio_sec": audio_sec,
+        "audio_hours_per_wall_hour": (audio_sec / wall_sec) if wall_sec > 0 else 0.0,
+        "stages": {
+            stage: {"total_sec": sec, "mean_sec": sec / n, "share": sec / busy}
+            for stage, sec in stage_totals.items()
+        },
+        "failures": [{"meeting_id": r["meeting_id"], "error": r["error"]} for r in results if r["status"] != "completed"],
+    }
+
+
+def print_report(report: Dict):
+    print()
+    print(f"Processed {report['processed']} meetings ({report['completed']} completed, "
+          f"{report['failed']} failed, {report['skipped']} skipped) with {report['workers']} workers")
+    print(f"Wall time: {report['wall_sec'] / 3600:.2f} h   Audio: {report['audio_sec'] / 3600:.2f} h   "
+          f"Throughput: {report['audio_hours_per_wall_hour']:.2f} audio-h / wall-h")
+    if report["stages"]:
+        print(f"{'stage':<15}{'total (s)':>12}{'mean (s)':>12}{'share':>8}")
+        for stage, st in sorted(report["stages"].items(), key=lambda kv: -kv[1]["total_sec"]):
+            print(f"{stage:<15}{st['total_sec']:>12.1f}{st['mean_sec']:>12.2f}{st['share']:>8.1%}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Batch-ingest recordings into the meeting analysis pipeline.")
+    p.add_argument("directory", nargs="?", help="Directory to scan recursively for recordings")
+    p.add_argument("--manifest", help="File listing recordings, one `path[<TAB>title]` per line")
+    p.add_argument("--workers", type=int, default=_default_workers(), help="Pipeline processes (default: sized to CPU/RAM)")
+    p.add_argument("--copy", action="store_true", help="Copy into the upload dir instead of hard-linking")
+    p.add_argument("--force", action="store_true", help="Reprocess recordings that already completed")
+    p.add_argument("--report", help="Write the throughput report as JSON to this path")
+    args = p.parse_args(argv)
+
+    if not args.directory and not args.manifest:
+        p.error("give a directory or --manifest")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    init_db()
+
+    items = read_manifest(args.manifest) if args.manifest else scan_directory(args.directory)
+    missing = [src for src, _ in items if not os.path.isfile(src)]
+    for src in missing:
+        logger.warning(f"Skipping missing file: {src}")
+    items = [it for it in items if os.path.isfile(it[0])]
+
+    todo, skipped = register_meetings(items, copy=args.copy, force=args.force)
+    logger.info(f"{len(items)} recordings found, {skipped} already completed, {len(todo)} to process")
+
+    results: List[Dict] = []
+    t0 = time.perf_counter()
+    try:
+        run_batch(todo, args.workers, results)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; re-run the same command to resume")
+
+    report = build_report(results, time.perf_counter() - t0, args.workers, skipped)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
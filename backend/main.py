@@ -1,27 +1,32 @@
 import os
 import json
+import base64
+import shutil
 import logging
-import traceback
-from typing import List
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from typing import List, Optional
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Query, Depends
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlmodel import select
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlmodel import select, func, or_, and_
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
-from config import CORS_ORIGINS, UPLOAD_DIR, PROCESSED_DIR
+from config import CORS_ORIGINS, UPLOAD_DIR, PROCESSED_DIR, UPLOAD_CONCURRENCY, SEARCH_CONCURRENCY, PIPELINE_WORKERS, PIPELINE_QUEUE_MAX
 from database import init_db, get_session, engine
-from models import Meeting, TranscriptSegment, Summary, Tag
-from schemas import UploadResponse, ProcessRequest, SegmentOut, SummaryOut, MeetingOut, SearchHit
-
-from utils_audio import extract_audio_to_wav
-from services.transcription import transcribe_with_whisper_cpp
-from services.diarization import assign_speakers
-from services.sentiment import score_sentiment
-from services.llm import summarize_and_extract
-from services.topics import simple_keywords, build_topic_graph
-from services.vector_store import upsert_meeting_segments, search as vector_search
+from models import Meeting, TranscriptSegment, Summary, Tag, PipelineStageTiming, VectorIndex, MeetingAnalytics, Artifact
+from schemas import UploadResponse, ProcessRequest, SegmentOut, SummaryOut, MeetingOut, SearchHit, StageTimingOut, SlowMeetingOut, ReindexRequest, VectorIndexOut, MeetingAnalyticsOut, AnalyticsAggregateOut, ArtifactOut, StorageStatsOut, StorageGcOut
+from metrics import instrument_engine, http_metrics_middleware, render_latest
+from admission import concurrency_limit, ConcurrencyLimitMiddleware, PipelineQueue, QueueFull, queue_full_error
+
+from pipeline import process_meeting_pipeline, build_analytics
+from services.topics import build_topic_graph
+from services.export import EXPORT_FORMATS
+from services.analytics import aggregate_rollups
+from services.vector_store import search_async as vector_search, close_async_clients
+from services.reindex import create_or_resume, run_reindex, progress, ReindexConflict
+from services.storage import record_artifact, collect_garbage, storage_stats
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,38 +37,58 @@ async def lifespan(app: FastAPI):
 
     # Setup logging
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per embedding request otherwise
     logger = logging.getLogger(__name__)
+    pipeline_queue.start()
     logger.info("Application started")
 
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    pipeline_queue.stop()
+    await close_async_clients()
+
+pipeline_queue = PipelineQueue(process_meeting_pipeline, workers=PIPELINE_WORKERS, maxsize=PIPELINE_QUEUE_MAX)
+search_limit = concurrency_limit("search", SEARCH_CONCURRENCY)
 
 app = FastAPI(title="Post-Meeting Analysis POC", version="0.1.0", lifespan=lifespan)
 
+# Uploads are limited before the body is read; CORS (added after) wraps the 503 too
+app.add_middleware(ConcurrencyLimitMiddleware, endpoint="upload", method="POST", path="/upload", limit=UPLOAD_CONCURRENCY)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS + ["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:5176", "http://127.0.0.1:5176", "http://localhost:8000", "http://127.0.0.1:8000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
+instrument_engine(engine)
+app.middleware("http")(http_metrics_middleware)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
 
 @app.post("/upload", response_model=UploadResponse)
 def upload_meeting(file: UploadFile = File(...)):
-    # Save upload
+    # Save upload, streamed in chunks rather than read whole into memory
     fname = f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
     dest = os.path.join(UPLOAD_DIR, fname)
     with open(dest, "wb") as f:
-        f.write(file.file.read())
+        shutil.copyfileobj(file.file, f, 1024 * 1024)
     # Create DB entry
     with get_session() as s:
         m = Meeting(title=os.path.splitext(file.filename)[0], filename=fname)
         s.add(m); s.commit(); s.refresh(m)
+        record_artifact(s, m.id, "upload", dest); s.commit(); s.refresh(m)
     return UploadResponse(meeting_id=m.id, filename=fname)
 
 @app.post("/meetings/{meeting_id}/process")
-def process_meeting(meeting_id: int, req: ProcessRequest, bg: BackgroundTasks):
+def process_meeting(meeting_id: int, req: ProcessRequest):
     with get_session() as s:
         m = s.get(Meeting, meeting_id)
         if not m:
@@ -75,9 +100,14 @@ def process_meeting(meeting_id: int, req: ProcessRequest, bg: BackgroundTasks):
         if m.status == "completed" and not req.force:
             return {"status": "already completed", "meeting_id": meeting_id}
 
-    # Kick off background processing
-    bg.add_task(_process_pipeline, meeting_id)
-    return {"status": "processing started", "meeting_id": meeting_id}
+    # Hand off to the pipeline workers; a full queue is the client's cue to back off
+    try:
+        queued = pipeline_queue.submit(meeting_id)
+    except QueueFull:
+        raise queue_full_error()
+    if not queued:
+        return {"status": "already queued", "meeting_id": meeting_id}
+    return {"status": "processing started", "meeting_id": meeting_id, "queue_depth": pipeline_queue.depth()}
 
 @app.get("/meetings/{meeting_id}/status")
 def get_processing_status(meeting_id: int):
@@ -92,116 +122,6 @@ def get_processing_status(meeting_id: int):
             "error_message": m.error_message
         }
 
-def _process_pipeline(meeting_id: int):
-    logger = logging.getLogger(__name__)
-    logger.info(f"Starting processing for meeting {meeting_id}")
-
-    try:
-        with get_session() as s:
-            m = s.get(Meeting, meeting_id)
-            if not m:
-                logger.error(f"Meeting {meeting_id} not found")
-                return
-
-            # Update status to processing
-            m.status = "processing"
-            m.error_message = None
-            s.add(m)
-            s.commit()
-            logger.info(f"Set meeting {meeting_id} status to processing")
-
-            input_path = os.path.join(UPLOAD_DIR, m.filename)
-            if not os.path.exists(input_path):
-                raise FileNotFoundError(f"Upload file not found: {input_path}")
-
-            logger.info(f"Extracting audio from {input_path}")
-            wav_path, duration = extract_audio_to_wav(input_path, PROCESSED_DIR, target_sr=16000)
-            m.duration_sec = duration
-            s.add(m)
-            s.commit()
-            logger.info(f"Audio extracted, duration: {duration}s")
-
-            # Transcribe
-            logger.info("Starting transcription...")
-            segs = transcribe_with_whisper_cpp(wav_path, PROCESSED_DIR)
-            logger.info(f"Transcription completed, {len(segs)} segments")
-
-            if not segs:
-                raise ValueError("No transcript segments generated")
-
-            # Diarize (assign speakers) & Sentiment
-            logger.info("Assigning speakers...")
-            speakers = assign_speakers(wav_path, segs, max_speakers=3)
-            logger.info("Scoring sentiment...")
-            sentiments = score_sentiment(segs)
-
-            # Persist segments
-            logger.info("Persisting segments to database...")
-            db_segments = []
-            for i, (seg, spk, sent) in enumerate(zip(segs, speakers, sentiments)):
-                dbs = TranscriptSegment(
-                    meeting_id=m.id, start=seg['start'], end=seg['end'],
-                    text=seg['text'], speaker=spk, sentiment=sent
-                )
-                s.add(dbs)
-                db_segments.append(dbs)
-            s.commit()
-            for dbs in db_segments:
-                s.refresh(dbs)
-            logger.info(f"Persisted {len(db_segments)} segments")
-
-            # Summary via LLM
-            logger.info("Generating summary...")
-            full_transcript = "\n".join([f"[{dbs.start:.1f}-{dbs.end:.1f}] {dbs.speaker}: {dbs.text}" for dbs in db_segments])
-            summary_obj = summarize_and_extract(full_transcript)
-
-            summary_row = Summary(
-                meeting_id=m.id,
-                overview=summary_obj.get("overview",""),
-                key_topics=json.dumps(summary_obj.get("key_topics", [])),
-                decisions=json.dumps(summary_obj.get("decisions", [])),
-                action_items=json.dumps(summary_obj.get("action_items", [])),
-                risks=json.dumps(summary_obj.get("risks", [])),
-                vibe=summary_obj.get("vibe", "neutral"),
-            )
-            s.add(summary_row)
-
-            # Tags (topics)
-            logger.info("Extracting topics...")
-            topics = summary_obj.get("key_topics", []) or simple_keywords(full_transcript, top_k=8)
-            for t in topics:
-                s.add(Tag(meeting_id=m.id, name=str(t)[:64]))
-            s.commit()
-
-            # Upsert vectors
-            logger.info("Creating vector embeddings...")
-            upsert_meeting_segments(
-                meeting_id=m.id,
-                meeting_title=m.title,
-                segments=[(seg.id, seg.text) for seg in db_segments]
-            )
-
-            # Mark as completed
-            m.status = "completed"
-            s.add(m)
-            s.commit()
-            logger.info(f"Processing completed successfully for meeting {meeting_id}")
-
-    except Exception as e:
-        logger.error(f"Processing failed for meeting {meeting_id}: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
-
-        try:
-            with get_session() as s:
-                m = s.get(Meeting, meeting_id)
-                if m:
-                    m.status = "failed"
-                    m.error_message = str(e)
-                    s.add(m)
-                    s.commit()
-        except Exception as db_e:
-            logger.error(f"Failed to update meeting status: {str(db_e)}")
-
 @app.get("/meetings", response_model=List[MeetingOut])
 def list_meetings():
     with get_session() as s:
@@ -227,13 +147,98 @@ def list_meetings():
             ))
         return out
 
+# Whisper never emits a segment longer than its 30 s window, so a segment overlapping
+# [from, to) starts no earlier than from - 30 s; the bound keeps range reads on the index.
+SEGMENT_LOOKBACK_SEC = 30.0
+# Rows per read when streaming an export
+EXPORT_BATCH_ROWS = 500
+
+def _segment_filters(meeting_id: int, from_: Optional[float], to: Optional[float], speaker: Optional[str]):
+    filters = [TranscriptSegment.meeting_id == meeting_id]
+    if from_ is not None:
+        filters += [TranscriptSegment.end > from_, TranscriptSegment.start >= from_ - SEGMENT_LOOKBACK_SEC]
+    if to is not None:
+        filters.append(TranscriptSegment.start < to)
+    if speaker:
+        filters.append(TranscriptSegment.speaker == speaker)
+    return filters
+
+def _encode_cursor(seg) -> str:
+    return base64.urlsafe_b64encode(f"{seg.start!r}:{seg.id}".encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        start, seg_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(start), int(seg_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _after(start: float, seg_id: int):
+    """Keyset condition for segments after (start, id) in (start, id) order."""
+    return or_(TranscriptSegment.start > start,
+               and_(TranscriptSegment.start == start, TranscriptSegment.id > seg_id))
+
 @app.get("/meetings/{meeting_id}/segments", response_model=List[SegmentOut])
-def get_segments(meeting_id: int):
+def get_segments(
+    meeting_id: int,
+    response: Response,
+    from_: Optional[float] = Query(None, alias="from", description="Only segments ending after this time (s)"),
+    to: Optional[float] = Query(None, description="Only segments starting before this time (s)"),
+    speaker: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+):
+    """Segments ordered by start time. With `limit`, the next page's cursor is returned in `X-Next-Cursor`."""
+    q = select(TranscriptSegment).where(*_segment_filters(meeting_id, from_, to, speaker))
+    if cursor:
+        q = q.where(_after(*_decode_cursor(cursor)))
+    q = q.order_by(TranscriptSegment.start, TranscriptSegment.id)
+    if limit:
+        q = q.limit(limit + 1)
     with get_session() as s:
-        segs = s.exec(select(TranscriptSegment).where(TranscriptSegment.meeting_id==meeting_id)).all()
-        return [SegmentOut(
-            id=x.id, start=x.start, end=x.end, text=x.text, speaker=x.speaker or "SPEAKER", sentiment=x.sentiment or 0.0
-        ) for x in segs]
+        segs = s.exec(q).all()
+    if limit and len(segs) > limit:
+        segs = segs[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(segs[-1])
+    return [SegmentOut(
+        id=x.id, start=x.start, end=x.end, text=x.text, speaker=x.speaker or "SPEAKER", sentiment=x.sentiment or 0.0
+    ) for x in segs]
+
+@app.get("/meetings/{meeting_id}/segments/export")
+def export_segments(
+    meeting_id: int,
+    format: str = Query("ndjson", description="ndjson, srt or vtt"),
+    from_: Optional[float] = Query(None, alias="from"),
+    to: Optional[float] = None,
+    speaker: Optional[str] = None,
+):
+    """Stream segments in keyset batches so memory stays flat for long meetings.
+
+    Each batch is read in its own short session: a cursor held open while a slow client
+    downloads would keep SQLite's shared lock and block the pipeline's writes.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, use one of: {', '.join(EXPORT_FORMATS)}")
+    render, media_type = EXPORT_FORMATS[format]
+    q = (select(TranscriptSegment.id, TranscriptSegment.start, TranscriptSegment.end, TranscriptSegment.text,
+                TranscriptSegment.speaker, TranscriptSegment.sentiment)
+         .where(*_segment_filters(meeting_id, from_, to, speaker))
+         .order_by(TranscriptSegment.start, TranscriptSegment.id))
+
+    def rows():
+        batch_q = q
+        while True:
+            with get_session() as s:
+                batch = s.exec(batch_q.limit(EXPORT_BATCH_ROWS)).all()
+            yield from batch
+            if len(batch) < EXPORT_BATCH_ROWS:
+                return
+            batch_q = q.where(_after(batch[-1].start, batch[-1].id))
+
+    return StreamingResponse(
+        render(rows()), media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="meeting_{meeting_id}.{format}"'},
+    )
 
 @app.get("/meetings/{meeting_id}/summary", response_model=SummaryOut | None)
 def get_summary(meeting_id: int):
@@ -250,14 +255,84 @@ def get_summary(meeting_id: int):
             vibe=summ.vibe
         )
 
-@app.get("/search", response_model=List[SearchHit])
-def search(q: str, top_k: int = 8):
-    hits = vector_search(q, top_k=top_k)
+def _rollup_dict(a: MeetingAnalytics) -> dict:
+    return {
+        "window_sec": a.window_sec,
+        "sentiment_series": json.loads(a.sentiment_series or "[]"),
+        "speakers": json.loads(a.speakers or "{}"),
+        "total_talk_sec": a.total_talk_sec,
+        "turn_count": a.turn_count,
+        "interruption_count": a.interruption_count,
+        "mean_sentiment": a.mean_sentiment,
+    }
+
+@app.get("/meetings/{meeting_id}/analytics", response_model=MeetingAnalyticsOut)
+def get_analytics(meeting_id: int):
+    """Precomputed talk time, turns, interruptions and windowed sentiment for one meeting."""
+    with get_session() as s:
+        a = s.exec(select(MeetingAnalytics).where(MeetingAnalytics.meeting_id==meeting_id)).first()
+        if not a:
+            # Meetings processed before rollups existed are backfilled on first read
+            m = s.get(Meeting, meeting_id)
+            if not m:
+                raise HTTPException(status_code=404, detail="Meeting not found")
+            segs = s.exec(select(TranscriptSegment).where(TranscriptSegment.meeting_id==meeting_id)).all()
+            if not segs:
+                raise HTTPException(status_code=404, detail="Meeting has no segments yet")
+            a = build_analytics(meeting_id, segs, m.duration_sec)
+            # Only completed meetings are saved: a running pipeline inserts its own row later
+            if m.status == "completed":
+                s.add(a)
+                try:
+                    s.commit()
+                    s.refresh(a)
+                except IntegrityError:
+                    # A concurrent request backfilled it first
+                    s.rollback()
+                    a = s.exec(select(MeetingAnalytics).where(MeetingAnalytics.meeting_id==meeting_id)).one()
+        return MeetingAnalyticsOut(meeting_id=meeting_id, **_rollup_dict(a))
+
+@app.get("/analytics", response_model=AnalyticsAggregateOut)
+def aggregate_analytics(
+    meeting_ids: Optional[str] = Query(None, description="Comma-separated ids; all meetings if omitted"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Aggregate rollups across meetings; reads one row per meeting, never raw segments."""
+    q = (select(MeetingAnalytics.speakers, MeetingAnalytics.total_talk_sec, MeetingAnalytics.turn_count,
+                MeetingAnalytics.interruption_count, MeetingAnalytics.mean_sentiment)
+         .join(Meeting, Meeting.id == MeetingAnalytics.meeting_id))
+    if meeting_ids:
+        try:
+            ids = [int(x) for x in meeting_ids.split(",") if x.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="meeting_ids must be comma-separated integers")
+        q = q.where(MeetingAnalytics.meeting_id.in_(ids))
+    if since:
+        q = q.where(Meeting.created_at >= since)
+    if until:
+        q = q.where(Meeting.created_at < until)
+    with get_session() as s:
+        # The sentiment series is left out: it is the bulk of each row and the aggregate does not use it
+        rollups = [{"speakers": json.loads(speakers or "{}"), "total_talk_sec": talk, "turn_count": turns,
+                    "interruption_count": interruptions, "mean_sentiment": sentiment}
+                   for speakers, talk, turns, interruptions, sentiment in s.exec(q).all()]
+    return AnalyticsAggregateOut(**aggregate_rollups(rollups))
+
+@app.get("/search", response_model=List[SearchHit], dependencies=[Depends(search_limit)])
+async def search(q: str, top_k: int = 8):
+    # Async so that waiting on Ollama holds no threadpool slot
+    hits = await vector_search(q, top_k=top_k)
+    return await run_in_threadpool(_search_hits_out, hits)
+
+def _search_hits_out(hits) -> List[SearchHit]:
     # augment with timing info
     with get_session() as s:
+        ids = [h["segment_id"] for h in hits]
+        segs = {x.id: x for x in s.exec(select(TranscriptSegment).where(TranscriptSegment.id.in_(ids))).all()} if ids else {}
         out = []
         for h in hits:
-            seg = s.get(TranscriptSegment, h["segment_id"])
+            seg = segs.get(h["segment_id"])
             if not seg:
                 continue
             out.append(SearchHit(
@@ -281,6 +356,91 @@ def graph(meeting_id: int):
         g = build_topic_graph(topics, seg_texts)
         return g
 
+def _index_out(idx: VectorIndex) -> VectorIndexOut:
+    return VectorIndexOut(
+        id=idx.id, collection=idx.collection, embed_model=idx.embed_model, status=idx.status,
+        indexed_count=idx.indexed_count, last_segment_id=idx.last_segment_id, **progress(idx),
+        created_at=idx.created_at.isoformat(),
+        activated_at=idx.activated_at.isoformat() if idx.activated_at else None,
+        error_message=idx.error_message
+    )
+
+@app.post("/admin/reindex", response_model=VectorIndexOut)
+def start_reindex(req: ReindexRequest, bg: BackgroundTasks):
+    """Build (or resume building) a new vector collection from stored segments, then switch search to it."""
+    try:
+        idx = create_or_resume(req.embed_model, abandon=req.abandon)
+    except ReindexConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    bg.add_task(run_reindex, idx.id)
+    return _index_out(idx)
+
+@app.get("/admin/reindex", response_model=List[VectorIndexOut])
+def list_indexes():
+    with get_session() as s:
+        return [_index_out(idx) for idx in s.exec(select(VectorIndex).order_by(VectorIndex.id)).all()]
+
+@app.get("/meetings/{meeting_id}/artifacts", response_model=List[ArtifactOut])
+def list_artifacts(meeting_id: int):
+    """Files kept on disk for a meeting, including ones already removed by retention (deleted_at set)."""
+    with get_session() as s:
+        if not s.get(Meeting, meeting_id):
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        rows = s.exec(select(Artifact).where(Artifact.meeting_id==meeting_id).order_by(Artifact.kind)).all()
+        return [ArtifactOut(
+            kind=a.kind, path=a.path, size_bytes=a.size_bytes, codec=a.codec, created_at=a.created_at.isoformat(),
+            last_accessed_at=a.last_accessed_at.isoformat() if a.last_accessed_at else None,
+            deleted_at=a.deleted_at.isoformat() if a.deleted_at else None,
+        ) for a in rows]
+
+@app.get("/admin/storage", response_model=StorageStatsOut)
+def get_storage_stats():
+    return StorageStatsOut(**storage_stats())
+
+@app.post("/admin/storage/gc", response_model=StorageGcOut)
+def run_storage_gc(dry_run: bool = False):
+    """Apply the retention rules now; with dry_run=true only report what would be removed."""
+    return StorageGcOut(**collect_garbage(dry_run=dry_run))
+
+@app.get("/meetings/{meeting_id}/timings", response_model=List[StageTimingOut])
+def get_timings(meeting_id: int, history: bool = Query(False, description="Every run, oldest first, not just the latest")):
+    """Stage timings of the meeting's latest pipeline run; each run ends with its `total` row."""
+    with get_session() as s:
+        rows = s.exec(select(PipelineStageTiming).where(PipelineStageTiming.meeting_id==meeting_id)
+                      .order_by(PipelineStageTiming.id)).all()
+    if not history:
+        totals = [i for i, r in enumerate(rows) if r.stage == "total"]
+        if len(totals) > 1:
+            rows = rows[totals[-2] + 1:]
+    return [StageTimingOut(stage=r.stage, duration_sec=r.duration_sec, recorded_at=r.recorded_at.isoformat()) for r in rows]
+
+def _latest_run_filter():
+    """Timing rows that belong to their meeting's latest run: those after the run before it ended."""
+    totals = (select(PipelineStageTiming.meeting_id, PipelineStageTiming.id,
+                     func.row_number().over(partition_by=PipelineStageTiming.meeting_id,
+                                            order_by=PipelineStageTiming.id.desc()).label("rn"))
+              .where(PipelineStageTiming.stage == "total").subquery())
+    prev = select(totals.c.meeting_id, totals.c.id).where(totals.c.rn == 2).subquery()
+    return prev, PipelineStageTiming.id > func.coalesce(prev.c.id, 0)
+
+@app.get("/debug/slow-meetings", response_model=List[SlowMeetingOut])
+def slow_meetings(stage: str = "total", limit: int = 20):
+    """Meetings whose most recent run spent the longest in `stage`."""
+    prev, in_latest_run = _latest_run_filter()
+    with get_session() as s:
+        rows = s.exec(
+            select(PipelineStageTiming, Meeting)
+            .join(Meeting, Meeting.id == PipelineStageTiming.meeting_id)
+            .outerjoin(prev, prev.c.meeting_id == PipelineStageTiming.meeting_id)
+            .where(PipelineStageTiming.stage == stage, in_latest_run)
+            .order_by(PipelineStageTiming.duration_sec.desc())
+            .limit(limit)
+        ).all()
+        return [SlowMeetingOut(
+            meeting_id=m.id, meeting_title=m.title, stage=t.stage, duration_sec=t.duration_sec,
+            audio_sec=m.duration_sec, recorded_at=t.recorded_at.isoformat()
+        ) for t, m in rows]
+
 @app.get("/debug/config")
 def debug_config():
     """Debug endpoint to check configuration"""
@@ -0,0 +1,104 @@
+import time
+import inspect
+import functools
+from contextvars import ContextVar
+from typing import Optional, List
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import event
+
+# Pipeline stages run from seconds (summary) to hours (transcription of long meetings)
+STAGE_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 3600, 7200)
+CALL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pma_pipeline_stage_seconds", "Wall time of each pipeline stage", ["stage"], buckets=STAGE_BUCKETS)
+PIPELINE_RUNS = Counter("pma_pipeline_runs_total", "Finished pipeline runs", ["status"])
+PIPELINE_QUEUE_DEPTH = Gauge("pma_pipeline_queue_depth", "Meetings scheduled for processing but not started")
+PIPELINE_IN_FLIGHT = Gauge("pma_pipeline_in_flight", "Meetings currently being processed")
+
+OLLAMA_SECONDS = Histogram(
+    "pma_ollama_request_seconds", "Latency of Ollama HTTP calls", ["endpoint"], buckets=CALL_BUCKETS)
+OLLAMA_ERRORS = Counter("pma_ollama_errors_total", "Failed Ollama HTTP calls", ["endpoint"])
+
+VECTOR_STORE_SECONDS = Histogram(
+    "pma_vector_store_seconds", "Latency of vector store operations", ["op"], buckets=CALL_BUCKETS)
+
+ADMISSION_REJECTED = Counter(
+    "pma_admission_rejected_total", "Requests turned away by admission control", ["endpoint"])
+ADMISSION_IN_FLIGHT = Gauge("pma_admission_in_flight", "Admitted requests currently running", ["endpoint"])
+
+HTTP_SECONDS = Histogram(
+    "pma_http_request_seconds", "HTTP request latency", ["method", "route", "status"], buckets=CALL_BUCKETS)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "pma_db_queries_per_request", "SQL statements executed per HTTP request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000))
+
+# Per-request SQL statement counter. Holds a one-element list so increments made in
+# FastAPI's worker threads (which run in a copy of the context) are seen by the middleware.
+_db_query_count: ContextVar[Optional[List[int]]] = ContextVar("db_query_count", default=None)
+
+
+def instrument_engine(engine):
+    """Count every SQL statement against the current request, if there is one."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter = _db_query_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def observe_call(histogram: Histogram, errors: Optional[Counter], label: str):
+    """Decorator timing a call into `histogram` and counting raised exceptions into `errors`.
+
+    Works on both plain and `async def` functions.
+    """
+    def wrap(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def inner_async(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    if errors is not None:
+                        errors.labels(label).inc()
+                    raise
+                finally:
+                    histogram.labels(label).observe(time.perf_counter() - t0)
+            return inner_async
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.labels(label).inc()
+                raise
+            finally:
+                histogram.labels(label).observe(time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+async def http_metrics_middleware(request, call_next):
+    counter = [0]
+    token = _db_query_count.set(counter)
+    t0 = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        _db_query_count.reset(token)
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        HTTP_SECONDS.labels(request.method, path, status).observe(time.perf_counter() - t0)
+        DB_QUERIES_PER_REQUEST.labels(path).observe(counter[0])
+
+
+def render_latest():
+    """Return (body, content type) for the /metrics endpoint."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 class Meeting(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -16,6 +16,9 @@ class Meeting(SQLModel, table=True):
     tags: List["Tag"] = Relationship(back_populates="meeting")
 
 class TranscriptSegment(SQLModel, table=True):
+    # Serves time-range reads and keyset pagination within a meeting
+    __table_args__ = (Index("ix_transcriptsegment_meeting_start", "meeting_id", "start"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     meeting_id: int = Field(foreign_key="meeting.id")
     start: float = 0.0
@@ -44,3 +47,47 @@ class Tag(SQLModel, table=True):
     name: str
 
     meeting: Optional[Meeting] = Relationship(back_populates="tags")
+
+class PipelineStageTiming(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    meeting_id: int = Field(foreign_key="meeting.id", index=True)
+    stage: str = Field(index=True)  # pipeline stage name, or "total" (the last row of each run)
+    duration_sec: float
+    recorded_at: datetime = Field(default_factory=datetime.utcnow)  # same for every row of a run
+
+class VectorIndex(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    collection: str = Field(unique=True)
+    embed_model: str
+    status: str = Field(default="building")  # building, active, retired, failed, abandoned
+    last_segment_id: int = 0  # re-index checkpoint: every segment id <= this is embedded
+    indexed_count: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    activated_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+
+class MeetingAnalytics(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    meeting_id: int = Field(foreign_key="meeting.id", unique=True)
+    window_sec: float
+    sentiment_series: str  # JSON list, talk-weighted mean sentiment per window (null = silence)
+    speakers: str  # JSON object: speaker -> talk_sec, talk_share, segments, turns, interruptions, mean_sentiment
+    total_talk_sec: float = 0.0
+    turn_count: int = 0
+    interruption_count: int = 0
+    mean_sentiment: float = 0.0
+    computed_at: datetime = Field(default_factory=datetime.utcnow)
+
+class Artifact(SQLModel, table=True):
+    # One row per file a meeting owns on disk; updated in place as the file is compressed or deleted
+    __table_args__ = (Index("ix_artifact_meeting_kind", "meeting_id", "kind", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    meeting_id: int = Field(foreign_key="meeting.id")
+    kind: str  # upload, audio, transcript
+    path: str
+    size_bytes: int = 0
+    codec: Optional[str] = None  # audio only: pcm, flac or opus
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_accessed_at: Optional[datetime] = None
+    deleted_at: Optional[datetime] = None
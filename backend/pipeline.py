@@ -0,0 +1,241 @@
+import os
+import json
+import time
+import logging
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+from sqlmodel import delete
+
+from config import UPLOAD_DIR, PROCESSED_DIR, ANALYTICS_WINDOW_SEC
+from database import get_session
+from models import Meeting, TranscriptSegment, Summary, Tag, PipelineStageTiming, MeetingAnalytics
+from metrics import PIPELINE_STAGE_SECONDS, PIPELINE_IN_FLIGHT, PIPELINE_RUNS
+
+from utils_audio import extract_audio_to_wav
+from services.transcription import transcribe_with_whisper_cpp
+from services.diarization import assign_speakers
+from services.sentiment import score_sentiment
+from services.analytics import compute_rollups
+from services.llm import summarize_and_extract
+from services.topics import simple_keywords
+from services.vector_store import upsert_meeting_segments
+from services.storage import rehydrate_audio, finalize_artifacts
+
+logger = logging.getLogger(__name__)
+
+# Stage names in execution order; used for timing reports
+STAGES = ["extraction", "transcription", "diarization", "sentiment", "persist", "analytics", "summary", "topics", "vectors", "storage"]
+
+
+@contextmanager
+def _stage(name: str, timings: Dict[str, float]):
+    """Record wall-clock seconds spent in a pipeline stage into `timings` and the stage histogram."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        timings[name] = timings.get(name, 0.0) + elapsed
+        PIPELINE_STAGE_SECONDS.labels(name).observe(elapsed)
+
+
+def _clear_derived(s, meeting_id: int):
+    """Drop rows produced by a previous (possibly interrupted) run so reprocessing starts clean.
+
+    Stage timings are kept, so runs before and after a change can be compared.
+    """
+    s.exec(delete(TranscriptSegment).where(TranscriptSegment.meeting_id == meeting_id))
+    s.exec(delete(Summary).where(Summary.meeting_id == meeting_id))
+    s.exec(delete(Tag).where(Tag.meeting_id == meeting_id))
+    s.exec(delete(MeetingAnalytics).where(MeetingAnalytics.meeting_id == meeting_id))
+
+
+def build_analytics(meeting_id: int, segments, duration_sec=None) -> MeetingAnalytics:
+    """Precompute speaker/sentiment rollups so readers never have to scan raw segments."""
+    rollup = compute_rollups(
+        [{"start": x.start, "end": x.end, "speaker": x.speaker, "sentiment": x.sentiment} for x in segments],
+        window_sec=ANALYTICS_WINDOW_SEC, duration_sec=duration_sec,
+    )
+    return MeetingAnalytics(
+        meeting_id=meeting_id,
+        window_sec=rollup["window_sec"],
+        sentiment_series=json.dumps(rollup["sentiment_series"], separators=(",", ":")),
+        speakers=json.dumps(rollup["speakers"], separators=(",", ":")),
+        total_talk_sec=rollup["total_talk_sec"],
+        turn_count=rollup["turn_count"],
+        interruption_count=rollup["interruption_count"],
+        mean_sentiment=rollup["mean_sentiment"],
+    )
+
+
+def _save_timings(meeting_id: int, timings: Dict[str, float]):
+    """Persist per-stage timings for this run so slow meetings can be found later.
+
+    Rows of one run share `recorded_at`, and `total` is written last, so it closes the run.
+    """
+    recorded_at = datetime.utcnow()
+    try:
+        with get_session() as s:
+            for stage, sec in timings.items():
+                s.add(PipelineStageTiming(meeting_id=meeting_id, stage=stage, duration_sec=sec, recorded_at=recorded_at))
+            s.commit()
+    except Exception as e:
+        logger.error(f"Failed to save stage timings for meeting {meeting_id}: {str(e)}")
+
+
+def process_meeting_pipeline(meeting_id: int) -> Dict[str, float]:
+    """Run the full analysis pipeline for one meeting.
+
+    Returns a dict of stage name -> seconds. Failures are recorded on the
+    Meeting row (status=failed) rather than raised.
+    """
+    logger.info(f"Starting processing for meeting {meeting_id}")
+    timings: Dict[str, float] = {}
+    status = "failed"
+    t_start = time.perf_counter()
+    PIPELINE_IN_FLIGHT.inc()
+
+    try:
+        with get_session() as s:
+            m = s.get(Meeting, meeting_id)
+            if not m:
+                logger.error(f"Meeting {meeting_id} not found")
+                return timings
+
+            # Update status to processing
+            m.status = "processing"
+            m.error_message = None
+            _clear_derived(s, m.id)
+            s.add(m)
+            s.commit()
+            logger.info(f"Set meeting {meeting_id} status to processing")
+
+            input_path = os.path.join(UPLOAD_DIR, m.filename)
+            rehydrated = not os.path.exists(input_path)
+            if rehydrated:
+                # The upload was garbage-collected; decode the archived audio instead
+                logger.info(f"Upload {input_path} is gone, rehydrating archived audio")
+                with _stage("extraction", timings):
+                    wav_path = rehydrate_audio(m.id)
+                if not wav_path:
+                    raise FileNotFoundError(f"Upload file not found: {input_path}")
+                duration = m.duration_sec
+            else:
+                logger.info(f"Extracting audio from {input_path}")
+                with _stage("extraction", timings):
+                    wav_path, duration = extract_audio_to_wav(input_path, PROCESSED_DIR, target_sr=16000)
+            m.duration_sec = duration
+            s.add(m)
+            s.commit()
+            logger.info(f"Audio extracted, duration: {duration}s")
+
+            # Transcribe
+            logger.info("Starting transcription...")
+            with _stage("transcription", timings):
+                segs = transcribe_with_whisper_cpp(wav_path, PROCESSED_DIR)
+            logger.info(f"Transcription completed, {len(segs)} segments")
+
+            if not segs:
+                raise ValueError("No transcript segments generated")
+
+            # Diarize (assign speakers) & Sentiment
+            logger.info("Assigning speakers...")
+            with _stage("diarization", timings):
+                speakers = assign_speakers(wav_path, segs, max_speakers=3)
+            logger.info("Scoring sentiment...")
+            with _stage("sentiment", timings):
+                sentiments = score_sentiment(segs)
+
+            # Persist segments
+            logger.info("Persisting segments to database...")
+            with _stage("persist", timings):
+                db_segments = []
+                for seg, spk, sent in zip(segs, speakers, sentiments):
+                    dbs = TranscriptSegment(
+                        meeting_id=m.id, start=seg['start'], end=seg['end'],
+                        text=seg['text'], speaker=spk, sentiment=sent
+                    )
+                    s.add(dbs)
+                    db_segments.append(dbs)
+                s.commit()
+                for dbs in db_segments:
+                    s.refresh(dbs)
+            logger.info(f"Persisted {len(db_segments)} segments")
+
+            logger.info("Computing analytics rollups...")
+            with _stage("analytics", timings):
+                # Committed with the summary and tags below
+                s.add(build_analytics(m.id, db_segments, m.duration_sec))
+
+            # Summary via LLM
+            logger.info("Generating summary...")
+            full_transcript = "\n".join([f"[{dbs.start:.1f}-{dbs.end:.1f}] {dbs.speaker}: {dbs.text}" for dbs in db_segments])
+            with _stage("summary", timings):
+                summary_obj = summarize_and_extract(full_transcript)
+
+            summary_row = Summary(
+                meeting_id=m.id,
+                overview=summary_obj.get("overview",""),
+                key_topics=json.dumps(summary_obj.get("key_topics", [])),
+                decisions=json.dumps(summary_obj.get("decisions", [])),
+                action_items=json.dumps(summary_obj.get("action_items", [])),
+                risks=json.dumps(summary_obj.get("risks", [])),
+                vibe=summary_obj.get("vibe", "neutral"),
+            )
+            s.add(summary_row)
+
+            # Tags (topics)
+            logger.info("Extracting topics...")
+            with _stage("topics", timings):
+                topics = summary_obj.get("key_topics", []) or simple_keywords(full_transcript, top_k=8)
+                for t in topics:
+                    s.add(Tag(meeting_id=m.id, name=str(t)[:64]))
+                s.commit()
+
+            # Upsert vectors
+            logger.info("Creating vector embeddings...")
+            with _stage("vectors", timings):
+                upsert_meeting_segments(
+                    meeting_id=m.id,
+                    meeting_title=m.title,
+                    segments=[(seg.id, seg.text) for seg in db_segments]
+                )
+
+            # Mark as completed
+            m.status = "completed"
+            s.add(m)
+            s.commit()
+            status = "completed"
+            logger.info(f"Processing completed successfully for meeting {meeting_id}")
+
+            # Compress the WAV and apply retention; the meeting is complete either way
+            try:
+                with _stage("storage", timings):
+                    finalize_artifacts(m.id, input_path, wav_path, reencode=not rehydrated)
+            except Exception as e:
+                logger.error(f"Storage lifecycle failed for meeting {meeting_id}: {str(e)}")
+
+    except Exception as e:
+        logger.error(f"Processing failed for meeting {meeting_id}: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+
+        try:
+            with get_session() as s:
+                m = s.get(Meeting, meeting_id)
+                if m:
+                    m.status = "failed"
+                    m.error_message = str(e)
+                    s.add(m)
+                    s.commit()
+        except Exception as db_e:
+            logger.error(f"Failed to update meeting status: {str(db_e)}")
+
+    finally:
+        PIPELINE_IN_FLIGHT.dec()
+
+    PIPELINE_RUNS.labels(status).inc()
+    if timings:
+        _save_timings(meeting_id, dict(timings, total=time.perf_counter() - t_start))
+    return timings
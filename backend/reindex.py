@@ -0,0 +1,42 @@
+"""Rebuild the vector index from stored transcript segments (e.g. after changing OLLAMA_EMBED_MODEL).
+
+Usage:
+    python reindex.py                       # uses OLLAMA_EMBED_MODEL
+    python reindex.py --model mxbai-embed-large
+    python reindex.py --model mxbai-embed-large --abandon   # give up an interrupted re-index for another model
+
+Progress is checkpointed in the `vectorindex` table; re-running resumes an
+unfinished re-index. Search switches to the new collection once it completes.
+"""
+import sys
+import logging
+import argparse
+
+from database import init_db, get_session
+from models import VectorIndex
+from services.reindex import create_or_resume, run_reindex, ReindexConflict
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Re-embed all transcript segments into a new vector collection.")
+    p.add_argument("--model", help="Embedding model (default: OLLAMA_EMBED_MODEL)")
+    p.add_argument("--abandon", action="store_true",
+                   help="Give up an unfinished re-index for another model, even one still building")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    init_db()
+    try:
+        idx = create_or_resume(args.model, abandon=args.abandon)
+    except ReindexConflict as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    run_reindex(idx.id)
+    with get_session() as s:
+        idx = s.get(VectorIndex, idx.id)
+        print(f"{idx.collection}: {idx.status}, {idx.indexed_count} segments embedded with {idx.embed_model}")
+        return 0 if idx.status == "active" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 class UploadResponse(BaseModel):
@@ -43,3 +43,90 @@ class SearchHit(BaseModel):
     end: float
     text: str
     score: float
+
+class StageTimingOut(BaseModel):
+    stage: str
+    duration_sec: float
+    recorded_at: str
+
+class SlowMeetingOut(BaseModel):
+    meeting_id: int
+    meeting_title: str
+    stage: str
+    duration_sec: float
+    audio_sec: float | None = None
+    recorded_at: str
+
+class ReindexRequest(BaseModel):
+    embed_model: str | None = None  # defaults to OLLAMA_EMBED_MODEL
+    abandon: bool = False  # give up an unfinished re-index for another model, even one still building
+
+class VectorIndexOut(BaseModel):
+    id: int
+    collection: str
+    embed_model: str
+    status: str
+    indexed_count: int
+    last_segment_id: int
+    total_segments: int
+    done_segments: int
+    created_at: str
+    activated_at: str | None = None
+    error_message: str | None = None
+
+class SpeakerStatsOut(BaseModel):
+    talk_sec: float
+    talk_share: float
+    segments: int
+    turns: int
+    interruptions: int
+    mean_sentiment: float
+
+class MeetingAnalyticsOut(BaseModel):
+    meeting_id: int
+    window_sec: float
+    sentiment_series: List[float | None]
+    speakers: Dict[str, SpeakerStatsOut]
+    total_talk_sec: float
+    turn_count: int
+    interruption_count: int
+    mean_sentiment: float
+
+class DistributionOut(BaseModel):
+    mean: float
+    p50: float
+    p90: float
+    max: float
+
+class AnalyticsAggregateOut(BaseModel):
+    meetings: int
+    total_talk_sec: float
+    turn_count: int
+    interruption_count: int
+    mean_sentiment: float
+    speakers_per_meeting: DistributionOut
+    dominant_speaker_share: DistributionOut  # talk share of each meeting's most talkative speaker
+
+class ArtifactOut(BaseModel):
+    kind: str  # upload, audio, transcript
+    path: str
+    size_bytes: int
+    codec: str | None = None
+    created_at: str
+    last_accessed_at: str | None = None
+    deleted_at: str | None = None
+
+class StorageKindOut(BaseModel):
+    files: int
+    bytes: int
+
+class StorageStatsOut(BaseModel):
+    kinds: Dict[str, StorageKindOut]  # kind, or kind:codec for audio
+    total_bytes: int
+    deleted_files: int
+
+class StorageGcOut(BaseModel):
+    dry_run: bool
+    deleted: int
+    freed_bytes: int
+    files: List[str]
@@ -0,0 +1,118 @@
+import math
+from typing import Dict, List, Optional
+
+# A speaker change counts as an interruption only when the new speaker starts more than this
+# before the previous segment ends. Whisper segments are contiguous (start == previous end),
+# so anything short of real overlap is an ordinary turn change; the margin absorbs rounding.
+INTERRUPTION_OVERLAP_SEC = 0.05
+
+
+def compute_rollups(segments: List[Dict], window_sec: float, duration_sec: Optional[float] = None) -> Dict:
+    """Per-meeting speaker and sentiment rollups from segments ordered by start.
+
+    Each segment needs start, end, speaker and sentiment. The sentiment series holds
+    the talk-time weighted mean for each `window_sec` window (None where nobody spoke).
+    """
+    segs = sorted(segments, key=lambda x: (x["start"], x["end"]))
+    end_time = max([duration_sec or 0.0] + [s["end"] for s in segs])
+    n_windows = max(1, math.ceil(end_time / window_sec)) if end_time > 0 else 1
+    w_sum = [0.0] * n_windows
+    w_talk = [0.0] * n_windows
+
+    speakers: Dict[str, Dict] = {}
+    turns = interruptions = 0
+    total_talk = sent_weighted = 0.0
+    prev = None
+
+    for seg in segs:
+        spk = seg.get("speaker") or "SPEAKER"
+        sent = seg.get("sentiment") or 0.0
+        dur = max(0.0, seg["end"] - seg["start"])
+        st = speakers.setdefault(spk, {"talk_sec": 0.0, "segments": 0, "turns": 0,
+                                       "interruptions": 0, "sentiment_sum": 0.0})
+        st["talk_sec"] += dur
+        st["segments"] += 1
+        st["sentiment_sum"] += sent * dur
+        total_talk += dur
+        sent_weighted += sent * dur
+
+        if prev is None or (prev.get("speaker") or "SPEAKER") != spk:
+            turns += 1
+            st["turns"] += 1
+            if prev is not None and seg["start"] < prev["end"] - INTERRUPTION_OVERLAP_SEC:
+                interruptions += 1
+                st["interruptions"] += 1
+        prev = seg
+
+        # Spread the segment over the windows it overlaps
+        w = int(seg["start"] // window_sec)
+        while w < n_windows and w * window_sec < seg["end"]:
+            overlap = min(seg["end"], (w + 1) * window_sec) - max(seg["start"], w * window_sec)
+            if overlap > 0:
+                w_sum[w] += sent * overlap
+                w_talk[w] += overlap
+            w += 1
+
+    speaker_out = {}
+    for spk, st in speakers.items():
+        speaker_out[spk] = {
+            "talk_sec": round(st["talk_sec"], 3),
+            "talk_share": round(st["talk_sec"] / total_talk, 4) if total_talk else 0.0,
+            "segments": st["segments"],
+            "turns": st["turns"],
+            "interruptions": st["interruptions"],
+            "mean_sentiment": round(st["sentiment_sum"] / st["talk_sec"], 4) if st["talk_sec"] else 0.0,
+        }
+
+    return {
+        "window_sec": window_sec,
+        "sentiment_series": [round(s / t, 4) if t else None for s, t in zip(w_sum, w_talk)],
+        "speakers": speaker_out,
+        "total_talk_sec": round(total_talk, 3),
+        "turn_count": turns,
+        "interruption_count": interruptions,
+        "mean_sentiment": round(sent_weighted / total_talk, 4) if total_talk else 0.0,
+    }
+
+
+def _distribution(values: List[float]) -> Dict:
+    """Mean, median, 90th percentile (nearest rank) and max of per-meeting values."""
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "max": 0.0}
+    v = sorted(values)
+
+    def rank(q: float) -> float:
+        return v[max(0, math.ceil(q * len(v)) - 1)]
+
+    return {"mean": round(sum(v) / len(v), 4), "p50": round(rank(0.5), 4), "p90": round(rank(0.9), 4),
+            "max": round(v[-1], 4)}
+
+
+def aggregate_rollups(rollups: List[Dict]) -> Dict:
+    """Combine per-meeting rollups (as returned by compute_rollups) without touching segments.
+
+    Speaker labels are cluster numbers within one meeting, so speakers are not merged
+    across meetings; instead each meeting contributes its speaker count and the talk
+    share of its most talkative speaker to a distribution.
+    """
+    total_talk = sent_weighted = 0.0
+    turns = interruptions = 0
+    speaker_counts, dominant_shares = [], []
+    for r in rollups:
+        total_talk += r["total_talk_sec"]
+        sent_weighted += r["mean_sentiment"] * r["total_talk_sec"]
+        turns += r["turn_count"]
+        interruptions += r["interruption_count"]
+        if r["speakers"]:
+            speaker_counts.append(len(r["speakers"]))
+            dominant_shares.append(max(st["talk_share"] for st in r["speakers"].values()))
+
+    return {
+        "meetings": len(rollups),
+        "total_talk_sec": round(total_talk, 3),
+        "turn_count": turns,
+        "interruption_count": interruptions,
+        "mean_sentiment": round(sent_weighted / total_talk, 4) if total_talk else 0.0,
+        "speakers_per_meeting": _distribution(speaker_counts),
+        "dominant_speaker_share": _distribution(dominant_shares),
+    }
@@ -0,0 +1,37 @@
+import json
+from typing import Iterable, Iterator
+
+# Rows are anything with id, start, end, text, speaker, sentiment attributes (ORM rows or column tuples)
+
+def _clock(seconds: float, sep: str) -> str:
+    ms = int(round(max(0.0, seconds) * 1000))
+    h, ms = divmod(ms, 3600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{ms:03d}"
+
+
+def iter_ndjson(rows: Iterable) -> Iterator[str]:
+    for r in rows:
+        yield json.dumps({
+            "id": r.id, "start": r.start, "end": r.end, "text": r.text,
+            "speaker": r.speaker or "SPEAKER", "sentiment": r.sentiment or 0.0,
+        }) + "\n"
+
+
+def iter_srt(rows: Iterable) -> Iterator[str]:
+    for i, r in enumerate(rows, 1):
+        yield f"{i}\n{_clock(r.start, ',')} --> {_clock(r.end, ',')}\n{r.speaker or 'SPEAKER'}: {r.text}\n\n"
+
+
+def iter_vtt(rows: Iterable) -> Iterator[str]:
+    yield "WEBVTT\n\n"
+    for r in rows:
+        yield f"{_clock(r.start, '.')} --> {_clock(r.end, '.')}\n<v {r.speaker or 'SPEAKER'}>{r.text}\n\n"
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "srt": (iter_srt, "application/x-subrip"),
+    "vtt": (iter_vtt, "text/vtt"),
+}
@@ -2,8 +2,10 @@ import json
 import requests
 from typing import Dict, List
 from config import OLLAMA_BASE, OLLAMA_MODEL
+from metrics import OLLAMA_SECONDS, OLLAMA_ERRORS, observe_call
 
 
+@observe_call(OLLAMA_SECONDS, OLLAMA_ERRORS, "generate")
 def _ollama_generate(prompt: str) -> str:
     url = f"{OLLAMA_BASE}/api/generate"
     payload = {"model": OLLAMA_MODEL, "prompt": prompt, "stream": False}
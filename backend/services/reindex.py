@@ -0,0 +1,142 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+from sqlmodel import select, func
+
+from config import OLLAMA_EMBED_MODEL, REINDEX_BATCH_SIZE
+from database import get_session
+from models import Meeting, TranscriptSegment, VectorIndex
+from services.vector_store import get_vector_client, upsert_into
+
+logger = logging.getLogger(__name__)
+
+# One re-index at a time per process
+_job_lock = threading.Lock()
+
+
+class ReindexConflict(Exception):
+    pass
+
+
+def create_or_resume(embed_model: Optional[str] = None, abandon: bool = False) -> VectorIndex:
+    """Return the unfinished index to resume, or register a new versioned collection for `embed_model`.
+
+    An unfinished index for another model is abandoned if it failed (or if `abandon` is set);
+    one still building is otherwise a conflict.
+    """
+    embed_model = embed_model or OLLAMA_EMBED_MODEL
+    with get_session() as s:
+        unfinished = s.exec(select(VectorIndex).where(VectorIndex.status.in_(["building", "failed"]))
+                            .order_by(VectorIndex.id.desc())).all()
+        idx = None
+        for other in unfinished:
+            if other.embed_model == embed_model and idx is None:
+                idx = other
+                continue
+            if other.status == "building" and not abandon:
+                raise ReindexConflict(
+                    f"Re-index {other.collection} for model {other.embed_model} is still building; "
+                    f"wait for it or abandon it")
+            logger.info(f"Abandoning unfinished re-index {other.collection} ({other.embed_model})")
+            other.status = "abandoned"
+            s.add(other)
+        if idx:
+            idx.status = "building"
+            idx.error_message = None
+        else:
+            idx = VectorIndex(collection="pending", embed_model=embed_model)
+            s.add(idx)
+            s.flush()
+            idx.collection = f"meetings_v{idx.id}"
+        s.add(idx)
+        s.commit()
+        s.refresh(idx)
+        return idx
+
+
+def _activate(s, idx: VectorIndex):
+    """Make `idx` the index search reads from; previous active index is retired in the same transaction."""
+    for old in s.exec(select(VectorIndex).where(VectorIndex.status == "active")).all():
+        old.status = "retired"
+        s.add(old)
+    idx.status = "active"
+    idx.activated_at = datetime.utcnow()
+    s.add(idx)
+    s.commit()
+
+
+def run_reindex(index_id: int, batch_size: int = REINDEX_BATCH_SIZE):
+    """Embed every segment into the index's collection in id order, checkpointing after each batch.
+
+    Safe to call again after a crash or failure: it continues after `last_segment_id`.
+    Search keeps using the current active index until the final switch.
+    """
+    if not _job_lock.acquire(blocking=False):
+        logger.info("Re-index already running in this process")
+        return
+    try:
+        with get_session() as s:
+            idx = s.get(VectorIndex, index_id)
+            if not idx or idx.status != "building":
+                return
+            collection, model, checkpoint = idx.collection, idx.embed_model, idx.last_segment_id
+        coll = get_vector_client().get_or_create_collection(name=collection)
+        logger.info(f"Re-indexing into {collection} with {model} from segment {checkpoint}")
+
+        while True:
+            with get_session() as s:
+                rows = s.exec(
+                    select(TranscriptSegment.id, TranscriptSegment.meeting_id, TranscriptSegment.text, Meeting.title)
+                    .join(Meeting, Meeting.id == TranscriptSegment.meeting_id)
+                    .where(TranscriptSegment.id > checkpoint)
+                    .order_by(TranscriptSegment.id)
+                    .limit(batch_size)
+                ).all()
+            if not rows:
+                break
+
+            upsert_into(
+                coll,
+                ids=[f"{mid}:{sid}" for sid, mid, _, _ in rows],
+                texts=[text for _, _, text, _ in rows],
+                metadatas=[{"meeting_id": mid, "meeting_title": title, "segment_id": sid} for sid, mid, _, title in rows],
+                model=model,
+            )
+            checkpoint = rows[-1][0]
+            with get_session() as s:
+                idx = s.get(VectorIndex, index_id)
+                if idx.status != "building":
+                    logger.info(f"Re-index {collection} stopped (status {idx.status})")
+                    return
+                idx.last_segment_id = checkpoint
+                idx.indexed_count += len(rows)
+                s.add(idx)
+                s.commit()
+
+        with get_session() as s:
+            idx = s.get(VectorIndex, index_id)
+            if idx.status != "building":
+                logger.info(f"Re-index {collection} stopped (status {idx.status})")
+                return
+            _activate(s, idx)
+        logger.info(f"Re-index complete; search now uses {collection}")
+
+    except Exception as e:
+        logger.error(f"Re-index {index_id} failed: {str(e)}")
+        with get_session() as s:
+            idx = s.get(VectorIndex, index_id)
+            if idx:
+                idx.status = "failed"
+                idx.error_message = str(e)
+                s.add(idx)
+                s.commit()
+    finally:
+        _job_lock.release()
+
+
+def progress(idx: VectorIndex) -> dict:
+    with get_session() as s:
+        total = s.exec(select(func.count(TranscriptSegment.id))).one()
+        done = s.exec(select(func.count(TranscriptSegment.id)).where(TranscriptSegment.id <= idx.last_segment_id)).one()
+    return {"total_segments": total, "done_segments": done}
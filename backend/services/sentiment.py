@@ -1,7 +1,12 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 
+from config import SENTIMENT_WORKERS, SENTIMENT_PARALLEL_MIN
+
 # Ensure VADER lexicon
 try:
     nltk.data.find('sentiment/vader_lexicon.zip')
@@ -10,9 +15,31 @@ except LookupError:
 
 sia = SentimentIntensityAnalyzer()
 
+# Long-lived pool so the lexicon is loaded once per worker, not once per meeting
+_pool = None
+# Pipeline worker threads may score at the same time; only one of them may create the pool
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is unsafe
+            _pool = ProcessPoolExecutor(max_workers=SENTIMENT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _score_texts(texts: List[str]) -> List[float]:
+    polarity = sia.polarity_scores
+    return [polarity(t)['compound'] for t in texts]
+
 def score_sentiment(segments: List[Dict]) -> List[float]:
+    texts = [seg['text'] for seg in segments]
+    # Small meetings score faster inline than the cost of shipping text to workers
+    if SENTIMENT_WORKERS <= 1 or len(texts) < SENTIMENT_PARALLEL_MIN:
+        return _score_texts(texts)
+    chunk = -(-len(texts) // (SENTIMENT_WORKERS * 4))
+    batches = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
     scores = []
-    for seg in segments:
-        s = sia.polarity_scores(seg['text'])['compound']
-        scores.append(s)
+    for part in _get_pool().map(_score_texts, batches):
+        scores.extend(part)
     return scores
@@ -0,0 +1,247 @@
+import os
+import logging
+import subprocess
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlmodel import select, func
+
+from config import (AUDIO_ARCHIVE_CODEC, OPUS_BITRATE, TRANSCRIPT_RETENTION_DAYS, UPLOAD_RETENTION_DAYS,
+                    UPLOAD_DIR, PROCESSED_DIR)
+from database import get_session
+from models import Artifact, Meeting
+from utils_audio import check_ffmpeg_available
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_EXTENSIONS = {"flac": ".flac", "opus": ".opus"}
+# Frames per block when transcoding, so hour-long recordings are never held in memory whole
+BLOCK_FRAMES = 1 << 16
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def wav_path_for(filename: str) -> str:
+    """Where extraction writes the 16 kHz WAV for an upload (see utils_audio)."""
+    return os.path.join(PROCESSED_DIR, os.path.splitext(os.path.basename(filename))[0] + "_mono16k.wav")
+
+
+def transcript_path_for(wav_path: str) -> str:
+    """Where transcription dumps the Whisper JSON for a WAV."""
+    return os.path.splitext(wav_path)[0] + ".json"
+
+
+def record_artifact(s, meeting_id: int, kind: str, path: str, codec: Optional[str] = None) -> Artifact:
+    """Insert or update the meeting's `kind` row from the file now at `path`. Caller commits."""
+    a = s.exec(select(Artifact).where(Artifact.meeting_id == meeting_id, Artifact.kind == kind)).first()
+    if not a:
+        a = Artifact(meeting_id=meeting_id, kind=kind, path=path)
+    a.path = path
+    a.size_bytes = _size(path)
+    a.codec = codec
+    a.created_at = datetime.utcnow()
+    a.deleted_at = None
+    s.add(a)
+    return a
+
+
+def _soundfile():
+    try:
+        import soundfile
+        return soundfile
+    except ImportError:
+        return None
+
+
+def _transcode(src: str, dst: str, codec: str):
+    """Write `src` to `dst` as `codec`: flac, opus, or pcm (16 kHz mono WAV).
+
+    FLAC/WAV go through soundfile when it is installed; Opus needs ffmpeg.
+    Writes to a temporary name first so a crash never leaves a truncated file at `dst`.
+    """
+    tmp = dst + ".part"
+    sf = _soundfile()
+    try:
+        if sf is not None and codec != "opus" and not src.endswith(".opus"):
+            fmt = "FLAC" if codec == "flac" else "WAV"
+            with sf.SoundFile(src) as fin, sf.SoundFile(tmp, "w", samplerate=fin.samplerate, channels=fin.channels,
+                                                        format=fmt, subtype="PCM_16") as fout:
+                for block in fin.blocks(blocksize=BLOCK_FRAMES, dtype="int16"):
+                    fout.write(block)
+        elif check_ffmpeg_available():
+            cmd = ["ffmpeg", "-y", "-v", "error", "-i", src, "-ac", "1"]
+            if codec == "opus":
+                cmd += ["-c:a", "libopus", "-b:a", OPUS_BITRATE, "-f", "ogg"]
+            elif codec == "flac":
+                cmd += ["-c:a", "flac", "-f", "flac"]
+            else:
+                cmd += ["-ar", "16000", "-c:a", "pcm_s16le", "-f", "wav"]
+            subprocess.run(cmd + [tmp], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        else:
+            raise RuntimeError(f"Writing {codec} audio needs soundfile or ffmpeg")
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def archive_audio(meeting_id: int, wav_path: str, reencode: bool = True) -> Artifact:
+    """Replace the processed WAV with a compressed copy and record it.
+
+    With `reencode=False` (the WAV was itself decoded from the archive) the existing
+    archive is kept and the WAV just removed, so lossy codecs never compound.
+    """
+    codec = AUDIO_ARCHIVE_CODEC
+    if codec == "opus" and not check_ffmpeg_available():
+        logger.warning("AUDIO_ARCHIVE_CODEC=opus needs ffmpeg; archiving as FLAC instead")
+        codec = "flac"
+
+    with get_session() as s:
+        if codec not in ARCHIVE_EXTENSIONS:
+            a = record_artifact(s, meeting_id, "audio", wav_path, codec="pcm")
+        else:
+            existing = s.exec(select(Artifact).where(Artifact.meeting_id == meeting_id, Artifact.kind == "audio")).first()
+            if not reencode and existing and existing.deleted_at is None and existing.codec in ARCHIVE_EXTENSIONS \
+                    and os.path.exists(existing.path):
+                a = existing
+            else:
+                dst = os.path.splitext(wav_path)[0] + ARCHIVE_EXTENSIONS[codec]
+                _transcode(wav_path, dst, codec)
+                a = record_artifact(s, meeting_id, "audio", dst, codec=codec)
+            os.remove(wav_path)
+        s.commit()
+        s.refresh(a)
+        return a
+
+
+def rehydrate_audio(meeting_id: int) -> Optional[str]:
+    """Path to a 16 kHz WAV for the meeting, decoding the archived audio if needed.
+
+    Returns None when no archive exists. The decoded WAV is removed again when the
+    pipeline finishes (or by the next garbage collection).
+    """
+    with get_session() as s:
+        a = s.exec(select(Artifact).where(Artifact.meeting_id == meeting_id, Artifact.kind == "audio",
+                                          Artifact.deleted_at.is_(None))).first()
+        if not a or not os.path.exists(a.path):
+            return None
+        wav_path = a.path
+        if a.codec != "pcm":
+            wav_path = os.path.splitext(a.path)[0] + ".wav"
+            if not os.path.exists(wav_path):
+                logger.info(f"Rehydrating {a.path}")
+                _transcode(a.path, wav_path, "pcm")
+        a.last_accessed_at = datetime.utcnow()
+        s.add(a)
+        s.commit()
+        return wav_path
+
+
+def finalize_artifacts(meeting_id: int, upload_path: str, wav_path: str, reencode: bool = True):
+    """Record a completed meeting's files, archive its audio and apply the retention rules."""
+    with get_session() as s:
+        if os.path.exists(upload_path):
+            record_artifact(s, meeting_id, "upload", upload_path)
+        transcript = transcript_path_for(wav_path)
+        if os.path.exists(transcript):
+            record_artifact(s, meeting_id, "transcript", transcript)
+        s.commit()
+    if os.path.exists(wav_path):
+        archive_audio(meeting_id, wav_path, reencode=reencode)
+    # Only this meeting's files; the full sweep is left to storage_gc.py and POST /admin/storage/gc
+    collect_garbage(meeting_id=meeting_id)
+
+
+def collect_garbage(dry_run: bool = False, now: Optional[datetime] = None, meeting_id: Optional[int] = None) -> Dict:
+    """Delete intermediates of completed meetings (or just `meeting_id`) that are past retention.
+
+    - transcript: Whisper JSON older than TRANSCRIPT_RETENTION_DAYS
+    - upload: original upload older than UPLOAD_RETENTION_DAYS, only if archived audio exists
+    - WAVs left behind by rehydration, unless the meeting is being processed
+    """
+    now = now or datetime.utcnow()
+    report = {"dry_run": dry_run, "deleted": 0, "freed_bytes": 0, "files": []}
+
+    def drop(path: str, size: int):
+        report["deleted"] += 1
+        report["freed_bytes"] += size
+        report["files"].append(path)
+        if not dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    with get_session() as s:
+        scope = [Artifact.meeting_id == meeting_id] if meeting_id is not None else []
+        archived = {}
+        for a, status in s.exec(select(Artifact, Meeting.status).join(Meeting, Meeting.id == Artifact.meeting_id)
+                                .where(Artifact.kind == "audio", Artifact.deleted_at.is_(None), *scope)).all():
+            if os.path.exists(a.path):
+                archived[a.meeting_id] = a
+            if a.codec != "pcm" and status != "processing":
+                leftover = os.path.splitext(a.path)[0] + ".wav"
+                if os.path.exists(leftover):
+                    drop(leftover, _size(leftover))
+
+        rules = [("transcript", TRANSCRIPT_RETENTION_DAYS), ("upload", UPLOAD_RETENTION_DAYS)]
+        for kind, days in rules:
+            if days is None:
+                continue
+            expired = s.exec(
+                select(Artifact).join(Meeting, Meeting.id == Artifact.meeting_id)
+                .where(Artifact.kind == kind, Artifact.deleted_at.is_(None), Meeting.status == "completed",
+                       Artifact.created_at < now - timedelta(days=days), *scope)
+            ).all()
+            for a in expired:
+                if kind == "upload" and a.meeting_id not in archived:
+                    continue
+                drop(a.path, a.size_bytes)
+                if not dry_run:
+                    a.deleted_at = now
+                    s.add(a)
+        if not dry_run:
+            s.commit()
+
+    if report["deleted"] and not dry_run:
+        logger.info(f"Storage GC removed {report['deleted']} files, {report['freed_bytes'] / 1024**2:.1f} MB")
+    return report
+
+
+def backfill_artifacts() -> int:
+    """Record and archive the files of completed meetings processed before artifacts were tracked."""
+    with get_session() as s:
+        tracked = set(s.exec(select(Artifact.meeting_id).where(Artifact.kind == "audio")).all())
+        todo = [(m.id, m.filename) for m in s.exec(select(Meeting).where(Meeting.status == "completed")).all()
+                if m.id not in tracked]
+    done = 0
+    for meeting_id, filename in todo:
+        wav_path = wav_path_for(filename)
+        if not os.path.exists(wav_path):
+            continue
+        try:
+            finalize_artifacts(meeting_id, os.path.join(UPLOAD_DIR, filename), wav_path)
+            done += 1
+        except Exception as e:
+            logger.error(f"Failed to archive meeting {meeting_id}: {str(e)}")
+    return done
+
+
+def storage_stats() -> Dict:
+    """Live file count and bytes per artifact kind (audio split by codec), from the artifact table only."""
+    out = {"kinds": {}, "total_bytes": 0, "deleted_files": 0}
+    with get_session() as s:
+        rows = s.exec(
+            select(Artifact.kind, Artifact.codec, func.count(Artifact.id), func.coalesce(func.sum(Artifact.size_bytes), 0))
+            .where(Artifact.deleted_at.is_(None)).group_by(Artifact.kind, Artifact.codec)
+        ).all()
+        out["deleted_files"] = s.exec(select(func.count(Artifact.id)).where(Artifact.deleted_at.is_not(None))).one()
+    for kind, codec, files, size in rows:
+        key = f"{kind}:{codec}" if codec else kind
+        out["kinds"][key] = {"files": files, "bytes": int(size)}
+        out["total_bytes"] += int(size)
+    return out
@@ -0,0 +1,332 @@
+"""Vector storage backends.
+
+Both backends hand out collections with the subset of the Chroma collection
+API the app uses: upsert(ids, documents, embeddings, metadatas),
+delete(where=...), query(query_embeddings, n_results, include, where=...) and
+count(). Select one with VECTOR_BACKEND=chroma|numpy.
+
+The numpy backend keeps each collection in a directory holding a
+memory-mapped embedding matrix (float32, float16 or int8 with a per-row
+scale) and a SQLite sidecar mapping row -> id, document and metadata.
+Vectors are L2-normalised on write, so search is an exact cosine top-k computed
+block by block over the mapped matrix. Metadata filters are pushed down to the
+sidecar and only matching rows are scored. Deleted rows are only marked
+dead; later upserts reuse their slots before the matrix grows.
+
+Both backends report cosine distance, so callers' `1 - distance` scores mean
+the same thing whichever backend is configured.
+"""
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import VECTOR_BACKEND, VECTOR_DIR, VECTOR_DTYPE, VECTOR_BLOCK_ROWS, CHROMA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+class ChromaBackend:
+    def __init__(self, path: str = CHROMA_DIR):
+        import chromadb
+        from chromadb.config import Settings
+
+        os.makedirs(path, exist_ok=True)
+        self.client = chromadb.PersistentClient(path=path, settings=Settings(allow_reset=False))
+        self._warned = set()
+
+    def get_or_create_collection(self, name: str):
+        # Chroma defaults to squared L2; the space is fixed when a collection is created
+        coll = self.client.get_or_create_collection(name=name, metadata={"hnsw:space": "cosine"})
+        space = (getattr(coll, "metadata", None) or {}).get("hnsw:space", "l2")
+        if space != "cosine" and name not in self._warned:
+            self._warned.add(name)
+            logger.warning(f"Chroma collection {name} uses {space} distance; run reindex.py to rebuild it with cosine")
+        return coll
+
+
+class NumpyCollection:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, path: str, dtype: str = "float32", block_rows: int = 8192):
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported VECTOR_DTYPE {dtype}; use one of {', '.join(_DTYPES)}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.block_rows = block_rows
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(os.path.join(path, "meta.sqlite"), check_same_thread=False, timeout=30)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY, id TEXT UNIQUE, meeting_id INTEGER,
+                document TEXT, metadata TEXT, live INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS ix_rows_meeting ON rows (meeting_id) WHERE live = 1;
+            CREATE INDEX IF NOT EXISTS ix_rows_dead ON rows (row) WHERE live = 0;
+        """)
+        info = self._info()
+        # dtype is fixed once a collection has been written
+        self.dtype = info.get("dtype", dtype)
+        self.dim = int(info["dim"]) if "dim" in info else None
+        self._version = None
+        self._vectors = self._scales = self._live = None  # memmaps, mapped once dim is known
+        self._capacity = 0
+        self._count = 0
+
+    # -- storage -----------------------------------------------------------------
+
+    def _info(self) -> Dict[str, str]:
+        return dict(self.db.execute("SELECT key, value FROM info").fetchall())
+
+    def _set_info(self, **kv):
+        self.db.executemany("INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+                            [(k, str(v)) for k, v in kv.items()])
+
+    @contextmanager
+    def _write_lock(self):
+        """Serialise writers across threads and, where supported, across processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.path, "write.lock"), "w") as lf:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _map(self, capacity: int):
+        np_dtype = _DTYPES[self.dtype]
+        files = {
+            "vectors": (np_dtype, (capacity, self.dim)),
+            "scales": (np.float32, (capacity,)),
+            "live": (np.uint8, (capacity,)),
+        }
+        for name, (dt, shape) in files.items():
+            p = os.path.join(self.path, f"{name}.bin")
+            nbytes = int(np.prod(shape)) * np.dtype(dt).itemsize
+            if not os.path.exists(p) or os.path.getsize(p) < nbytes:
+                with open(p, "ab") as f:
+                    f.truncate(nbytes)
+            setattr(self, f"_{name}", np.memmap(p, dtype=dt, mode="r+", shape=shape))
+        self._capacity = capacity
+
+    def _refresh(self):
+        """Pick up writes made by other handles (or processes) since we last looked."""
+        info = self._info()
+        version = info.get("version")
+        if version == self._version and self._vectors is not None:
+            return
+        self.dim = int(info["dim"]) if "dim" in info else self.dim
+        self._count = int(info.get("count", 0))
+        capacity = int(info.get("capacity", 0))
+        if self.dim and capacity and capacity != self._capacity:
+            self._map(capacity)
+        self._version = version
+
+    def _encode(self, vecs: np.ndarray):
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        vecs = vecs / np.where(norms == 0, 1.0, norms)
+        if self.dtype == "int8":
+            scale = np.abs(vecs).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            return np.round(vecs / scale[:, None]).astype(np.int8), scale.astype(np.float32)
+        return vecs.astype(_DTYPES[self.dtype]), np.ones(len(vecs), dtype=np.float32)
+
+    # -- collection API ---------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return int(np.count_nonzero(self._live[:self._count])) if self._live is not None else 0
+
+    def upsert(self, ids: List[str], documents: List[str], embeddings, metadatas: List[dict]):
+        if not ids:
+            return
+        vecs = np.asarray(embeddings, dtype=np.float32)
+        with self._write_lock():
+            self._refresh()
+            if self.dim is None:
+                self.dim = vecs.shape[1]
+                self._set_info(dim=self.dim, dtype=self.dtype)
+            if vecs.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vecs.shape[1]} does not match collection dimension {self.dim}")
+
+            existing = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                q = f"SELECT id, row FROM rows WHERE id IN ({','.join('?' * len(chunk))})"
+                existing.update(self.db.execute(q, chunk).fetchall())
+            # New ids take over slots freed by delete() before the matrix grows, so reprocessing a
+            # meeting (which deletes its vectors and writes them back under new ids) stays the same size
+            n_new = len(set(ids) - set(existing))
+            taken = set(existing.values())
+            free = iter([r for (r,) in self.db.execute("SELECT row FROM rows WHERE live = 0 ORDER BY row LIMIT ?",
+                                                       (n_new + len(taken),)) if r not in taken])
+            rows = []
+            count = self._count
+            for id_ in ids:
+                if id_ not in existing:
+                    slot = next(free, None)
+                    if slot is not None:
+                        existing[id_] = slot
+                    else:
+                        existing[id_] = count
+                        count += 1
+                rows.append(existing[id_])
+
+            if count > self._capacity:
+                capacity = max(self.INITIAL_CAPACITY, self._capacity)
+                while capacity < count:
+                    capacity *= 2
+                self._map(capacity)
+
+            data, scales = self._encode(vecs)
+            idx = np.asarray(rows, dtype=np.int64)
+            self._vectors[idx] = data
+            self._scales[idx] = scales
+            self._live[idx] = 1
+            for arr in (self._vectors, self._scales, self._live):
+                arr.flush()
+
+            self.db.executemany(
+                "INSERT OR REPLACE INTO rows (row, id, meeting_id, document, metadata, live) VALUES (?, ?, ?, ?, ?, 1)",
+                [(r, id_, (md or {}).get("meeting_id"), doc, json.dumps(md or {}))
+                 for r, id_, doc, md in zip(rows, ids, documents, metadatas)],
+            )
+            self._set_info(count=count, capacity=self._capacity, version=int(self._info().get("version", 0)) + 1)
+            self.db.commit()
+            self._version = None
+
+    def _where_sql(self, where: Optional[dict]):
+        """Translate a Chroma-style equality filter into SQL over the sidecar."""
+        clauses, params = ["live = 1"], []
+        for key, value in (where or {}).items():
+            if isinstance(value, dict):
+                (op, value), = value.items()
+                if op != "$eq":
+                    raise ValueError(f"Unsupported filter operator {op}")
+            if not key.isidentifier():
+                raise ValueError(f"Unsupported metadata key {key!r}")
+            if key == "meeting_id":
+                clauses.append("meeting_id = ?")
+            else:
+                clauses.append(f"json_extract(metadata, '$.{key}') = ?")
+            params.append(value)
+        return " AND ".join(clauses), params
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[dict] = None):
+        with self._write_lock():
+            sql, params = self._where_sql(where)
+            if ids:
+                sql += f" AND id IN ({','.join('?' * len(ids))})"
+                params += list(ids)
+            self._refresh()
+            rows = [r for (r,) in self.db.execute(f"SELECT row FROM rows WHERE {sql}", params)]
+            if not rows:
+                return
+            self.db.execute(f"UPDATE rows SET live = 0 WHERE {sql}", params)
+            self._live[np.asarray(rows, dtype=np.int64)] = 0
+            self._live.flush()
+            self._set_info(version=int(self._info().get("version", 0)) + 1)
+            self.db.commit()
+            self._version = None
+
+    def _score(self, rows: np.ndarray, q: np.ndarray) -> np.ndarray:
+        return (np.asarray(self._vectors[rows], dtype=np.float32) @ q) * self._scales[rows]
+
+    def query(self, query_embeddings, n_results: int = 10, include=None, where: Optional[dict] = None):
+        n_results = max(1, n_results)
+        q = np.asarray(query_embeddings[0], dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        with self._lock:
+            self._refresh()
+            if self._vectors is None or self._count == 0:
+                return {"ids": [[]], "documents": [[]], "distances": [[]], "metadatas": [[]]}
+            if q.shape[0] != self.dim:
+                raise ValueError(f"Query dimension {q.shape[0]} does not match collection dimension {self.dim}")
+
+            best_rows = np.empty(0, dtype=np.int64)
+            best_scores = np.empty(0, dtype=np.float32)
+
+            def merge(rows, scores):
+                nonlocal best_rows, best_scores
+                rows = np.concatenate([best_rows, rows])
+                scores = np.concatenate([best_scores, scores])
+                if len(scores) > n_results:
+                    keep = np.argpartition(-scores, n_results - 1)[:n_results]
+                    rows, scores = rows[keep], scores[keep]
+                best_rows, best_scores = rows, scores
+
+            if where:
+                sql, params = self._where_sql(where)
+                cand = np.fromiter((r for (r,) in self.db.execute(f"SELECT row FROM rows WHERE {sql}", params)),
+                                   dtype=np.int64)
+                cand.sort()
+                for i in range(0, len(cand), self.block_rows):
+                    rows = cand[i:i + self.block_rows]
+                    merge(rows, self._score(rows, q))
+            else:
+                for start in range(0, self._count, self.block_rows):
+                    stop = min(start + self.block_rows, self._count)
+                    scores = (np.asarray(self._vectors[start:stop], dtype=np.float32) @ q) * self._scales[start:stop]
+                    live = self._live[start:stop].astype(bool)
+                    merge(np.arange(start, stop)[live], scores[live])
+
+            order = np.argsort(-best_scores)
+            best_rows, best_scores = best_rows[order], best_scores[order]
+            meta = {}
+            if len(best_rows):
+                placeholders = ",".join("?" * len(best_rows))
+                meta = {r: (id_, doc, md) for r, id_, doc, md in self.db.execute(
+                    f"SELECT row, id, document, metadata FROM rows WHERE row IN ({placeholders})",
+                    [int(r) for r in best_rows])}
+
+        hits = [(meta[int(r)], float(s)) for r, s in zip(best_rows, best_scores) if int(r) in meta]
+        return {
+            "ids": [[h[0][0] for h in hits]],
+            "documents": [[h[0][1] for h in hits]],
+            "metadatas": [[json.loads(h[0][2]) for h in hits]],
+            # Cosine distance, matching how callers turn distances into scores
+            "distances": [[1.0 - s for _, s in hits]],
+        }
+
+
+class NumpyBackend:
+    def __init__(self, path: str = VECTOR_DIR, dtype: str = VECTOR_DTYPE, block_rows: int = VECTOR_BLOCK_ROWS):
+        self.path = path
+        self.dtype = dtype
+        self.block_rows = block_rows
+        self._collections: Dict[str, NumpyCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str) -> NumpyCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = NumpyCollection(os.path.join(self.path, name), self.dtype, self.block_rows)
+            return self._collections[name]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """Process-wide backend instance, built on first use."""
+    if VECTOR_BACKEND == "numpy":
+        return NumpyBackend()
+    if VECTOR_BACKEND == "chroma":
+        return ChromaBackend()
+    raise ValueError(f"Unknown VECTOR_BACKEND {VECTOR_BACKEND}; use chroma or numpy")
@@ -1,52 +1,159 @@
-import os
-from typing import List, Tuple
-import chromadb
-from chromadb.config import Settings
+import logging
+from typing import List, Optional, Tuple
+import httpx
 import requests
-from config import CHROMA_DIR, OLLAMA_BASE, OLLAMA_EMBED_MODEL
+from anyio import to_thread, CapacityLimiter
+from sqlmodel import select
+from config import OLLAMA_BASE, OLLAMA_EMBED_MODEL, VECTOR_QUERY_THREADS
+from database import get_session
+from models import VectorIndex
+from metrics import VECTOR_STORE_SECONDS, OLLAMA_SECONDS, OLLAMA_ERRORS, observe_call
+from services.vector_backends import get_backend
 
-def get_chroma_client():
-    os.makedirs(CHROMA_DIR, exist_ok=True)
-    client = chromadb.PersistentClient(path=CHROMA_DIR, settings=Settings(allow_reset=False))
-    return client
+logger = logging.getLogger(__name__)
 
-def _embed(texts: List[str]) -> List[List[float]]:
+# Collection used before versioned indexes existed; still served until a re-index is activated
+LEGACY_COLLECTION = "meetings"
+
+def get_vector_client():
+    """Shared vector backend; constructed once per process (timed on first use)."""
+    with VECTOR_STORE_SECONDS.labels("client").time():
+        return get_backend()
+
+@observe_call(OLLAMA_SECONDS, OLLAMA_ERRORS, "embeddings")
+def _embed_one(text: str, model: str = OLLAMA_EMBED_MODEL) -> List[float]:
     url = f"{OLLAMA_BASE}/api/embeddings"
+    payload = {"model": model, "prompt": text}
+    r = requests.post(url, json=payload, timeout=300)
+    r.raise_for_status()
+    data = r.json()
+    # Ollama returns {embedding: [...]}
+    return data.get("embedding", [])
+
+# Request-path clients: one pooled httpx client and a thread limiter of its own for the blocking
+# vector store, so a slow Ollama or Chroma cannot exhaust the threadpool the other endpoints share.
+_async_http: Optional[httpx.AsyncClient] = None
+_query_limiter: Optional[CapacityLimiter] = None
+
+def _get_async_http() -> httpx.AsyncClient:
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient(timeout=300)
+    return _async_http
+
+def _get_query_limiter() -> CapacityLimiter:
+    global _query_limiter
+    if _query_limiter is None:
+        _query_limiter = CapacityLimiter(VECTOR_QUERY_THREADS)
+    return _query_limiter
+
+async def close_async_clients():
+    """Called on shutdown; both objects are tied to the running event loop."""
+    global _async_http, _query_limiter
+    if _async_http is not None:
+        await _async_http.aclose()
+    _async_http = None
+    _query_limiter = None
+
+@observe_call(OLLAMA_SECONDS, OLLAMA_ERRORS, "embeddings")
+async def _embed_one_async(text: str, model: str = OLLAMA_EMBED_MODEL) -> List[float]:
+    r = await _get_async_http().post(f"{OLLAMA_BASE}/api/embeddings", json={"model": model, "prompt": text})
+    r.raise_for_status()
+    return r.json().get("embedding", [])
+
+def _embed(texts: List[str], model: str = OLLAMA_EMBED_MODEL) -> List[List[float]]:
     embeddings = []
 
     # Process each text individually since Ollama expects single prompt
     for text in texts:
-        payload = {"model": OLLAMA_EMBED_MODEL, "prompt": text}
-        r = requests.post(url, json=payload, timeout=300)
-        r.raise_for_status()
-        data = r.json()
-        # Ollama returns {embedding: [...]}
-        emb = data.get("embedding", [])
+        emb = _embed_one(text, model)
         if emb:
             embeddings.append(emb)
 
     return embeddings
 
+def active_index() -> Tuple[str, str]:
+    """(collection, embed model) that search reads from."""
+    with get_session() as s:
+        idx = s.exec(select(VectorIndex).where(VectorIndex.status == "active")).first()
+        if idx:
+            return idx.collection, idx.embed_model
+    return LEGACY_COLLECTION, OLLAMA_EMBED_MODEL
+
+def write_targets() -> List[Tuple[str, str]]:
+    """The active index plus any unfinished one, so new meetings land in both.
+
+    Failed indexes are included because they can be resumed: the job only embeds segments
+    after its checkpoint, and SQLite may hand a reprocessed meeting's segments reused ids
+    below it.
+    """
+    targets = [active_index()]
+    with get_session() as s:
+        for idx in s.exec(select(VectorIndex).where(VectorIndex.status.in_(["building", "failed"]))).all():
+            targets.append((idx.collection, idx.embed_model))
+    return targets
+
+def upsert_into(coll, ids: List[str], texts: List[str], metadatas: List[dict], model: str):
+    embeddings = _embed(texts, model)
+    if len(embeddings) != len(texts):
+        raise RuntimeError(f"Embedding model {model} returned {len(embeddings)} vectors for {len(texts)} texts")
+    with VECTOR_STORE_SECONDS.labels("upsert").time():
+        coll.upsert(ids=ids, documents=texts, embeddings=embeddings, metadatas=metadatas)
+
 def upsert_meeting_segments(meeting_id: int, meeting_title: str, segments: List[Tuple[int, str]]):
-    client = get_chroma_client()
-    coll = client.get_or_create_collection(name="meetings")
+    client = get_vector_client()
     ids = [f"{meeting_id}:{seg_id}" for seg_id, _ in segments]
     texts = [text for _, text in segments]
     metadatas = [{"meeting_id": meeting_id, "meeting_title": meeting_title, "segment_id": seg_id} for seg_id, _ in segments]
-    embeddings = _embed(texts)
-    coll.upsert(ids=ids, documents=texts, embeddings=embeddings, metadatas=metadatas)
+    active, *unfinished = write_targets()
+    for name, model in [active] + unfinished:
+        try:
+            coll = client.get_or_create_collection(name=name)
+            # Reprocessing assigns new segment ids; drop vectors from the previous run
+            coll.delete(where={"meeting_id": meeting_id})
+            upsert_into(coll, ids, texts, metadatas, model)
+        except Exception as e:
+            if name == active[0]:
+                raise
+            # A broken rebuild (e.g. a misspelled model) must not fail every new meeting
+            logger.error(f"Writing meeting {meeting_id} into re-index {name} failed: {str(e)}")
+            _fall_behind(name, min((seg_id for seg_id, _ in segments), default=1), str(e))
+
+def _fall_behind(collection: str, seg_id: int, error: str):
+    """Mark an unfinished index failed, with its checkpoint moved back so a resume re-embeds from `seg_id`."""
+    with get_session() as s:
+        idx = s.exec(select(VectorIndex).where(VectorIndex.collection == collection)).first()
+        if not idx or idx.status not in ("building", "failed"):
+            return
+        idx.status = "failed"
+        idx.error_message = error
+        idx.last_segment_id = min(idx.last_segment_id, seg_id - 1)
+        s.add(idx)
+        s.commit()
 
 def search(query: str, top_k: int = 8):
-    client = get_chroma_client()
-    coll = client.get_or_create_collection(name="meetings")
+    name, model = active_index()
 
     # Get embeddings for the query
-    embeddings = _embed([query])
+    embeddings = _embed([query], model)
     if not embeddings or not embeddings[0]:
         return []  # Return empty results if embedding fails
 
-    q_emb = embeddings[0]
-    res = coll.query(query_embeddings=[q_emb], n_results=top_k, include=["documents", "distances", "metadatas"])
+    return _query_hits(name, embeddings[0], top_k)
+
+async def search_async(query: str, top_k: int = 8):
+    """`search` for async endpoints: nothing here blocks the event loop."""
+    limiter = _get_query_limiter()
+    name, model = await to_thread.run_sync(active_index, limiter=limiter)
+    q_emb = await _embed_one_async(query, model)
+    if not q_emb:
+        return []
+    return await to_thread.run_sync(_query_hits, name, q_emb, top_k, limiter=limiter)
+
+def _query_hits(name: str, q_emb: List[float], top_k: int):
+    coll = get_vector_client().get_or_create_collection(name=name)
+    with VECTOR_STORE_SECONDS.labels("query").time():
+        res = coll.query(query_embeddings=[q_emb], n_results=top_k, include=["documents", "distances", "metadatas"])
 
     # Check if we have results
     if not res.get("ids") or not res["ids"][0]:
@@ -0,0 +1,41 @@
+"""Apply the storage retention rules (e.g. from cron) and report disk usage.
+
+Usage:
+    python storage_gc.py                 # delete expired intermediates
+    python storage_gc.py --dry-run       # only list what would be deleted
+    python storage_gc.py --backfill      # first archive meetings processed before artifacts were tracked
+
+Retention is configured with TRANSCRIPT_RETENTION_DAYS and UPLOAD_RETENTION_DAYS,
+the archive codec with AUDIO_ARCHIVE_CODEC (see README).
+"""
+import sys
+import logging
+import argparse
+
+from database import init_db
+from services.storage import collect_garbage, backfill_artifacts, storage_stats
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description="Compress and garbage-collect meeting artifacts.")
+    p.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting it")
+    p.add_argument("--backfill", action="store_true", help="Archive audio of completed meetings not yet tracked")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    init_db()
+    if args.backfill:
+        print(f"Archived {backfill_artifacts()} meetings")
+    report = collect_garbage(dry_run=args.dry_run)
+    for path in report["files"]:
+        print(("would delete " if args.dry_run else "deleted ") + path)
+    print(f"{report['deleted']} files, {report['freed_bytes'] / 1024**2:.1f} MB"
+          + (" would be freed" if args.dry_run else " freed"))
+    stats = storage_stats()
+    for kind, st in sorted(stats["kinds"].items()):
+        print(f"{kind:<16}{st['files']:>8} files{st['bytes'] / 1024**2:>12.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
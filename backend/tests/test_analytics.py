@@ -0,0 +1,61 @@
+import pytest
+
+from services.analytics import INTERRUPTION_OVERLAP_SEC, aggregate_rollups, compute_rollups
+
+
+def _seg(start, end, speaker, sentiment=0.0):
+    return {"start": start, "end": end, "speaker": speaker, "sentiment": sentiment}
+
+
+def test_contiguous_speaker_changes_are_turns_not_interruptions():
+    r = compute_rollups([_seg(0, 5, "A"), _seg(5, 9, "B"), _seg(9, 12, "A"), _seg(12, 14, "A")], window_sec=30)
+    assert r["turn_count"] == 3
+    assert r["interruption_count"] == 0
+    assert r["speakers"]["A"]["turns"] == 2
+    assert r["speakers"]["A"]["segments"] == 3
+
+
+def test_only_real_overlap_counts_as_an_interruption():
+    small = INTERRUPTION_OVERLAP_SEC / 2
+    r = compute_rollups([_seg(0, 5, "A"), _seg(5 - small, 9, "B"), _seg(7, 10, "A")], window_sec=30)
+    assert r["turn_count"] == 3
+    assert r["interruption_count"] == 1
+    assert r["speakers"]["A"]["interruptions"] == 1
+    assert r["speakers"]["B"]["interruptions"] == 0
+
+
+def test_talk_time_and_windowed_sentiment():
+    # A speaks 0-20 (+1), B 20-40 (-1), nobody 60-90
+    r = compute_rollups([_seg(0, 20, "A", 1.0), _seg(20, 40, "B", -1.0)], window_sec=30, duration_sec=90)
+    assert r["sentiment_series"] == [pytest.approx(1 / 3, abs=1e-4), -1.0, None]
+    assert r["total_talk_sec"] == 40
+    assert r["mean_sentiment"] == 0.0
+    assert r["speakers"]["A"]["talk_share"] == 0.5
+    assert r["speakers"]["B"]["mean_sentiment"] == -1.0
+
+
+def test_unsorted_and_unlabelled_segments():
+    r = compute_rollups([_seg(5, 9, None), _seg(0, 5, "A")], window_sec=30)
+    assert set(r["speakers"]) == {"A", "SPEAKER"}
+    assert r["turn_count"] == 2
+
+
+def test_aggregate_does_not_merge_speaker_labels_across_meetings():
+    one = compute_rollups([_seg(0, 30, "SPEAKER 1", 0.5), _seg(30, 40, "SPEAKER 2", 0.5)], window_sec=30)
+    two = compute_rollups([_seg(0, 10, "SPEAKER 1"), _seg(10, 20, "SPEAKER 2"), _seg(20, 30, "SPEAKER 3")],
+                          window_sec=30)
+    agg = aggregate_rollups([one, two])
+    assert "speakers" not in agg
+    assert agg["meetings"] == 2
+    assert agg["total_talk_sec"] == 70
+    assert agg["turn_count"] == 5
+    assert agg["mean_sentiment"] == pytest.approx(20 / 70, abs=1e-4)
+    assert agg["speakers_per_meeting"] == {"mean": 2.5, "p50": 2, "p90": 3, "max": 3}
+    assert agg["dominant_speaker_share"]["max"] == 0.75
+    assert agg["dominant_speaker_share"]["p50"] == pytest.approx(1 / 3, abs=1e-4)
+
+
+def test_aggregate_of_nothing():
+    agg = aggregate_rollups([])
+    assert agg["meetings"] == 0
+    assert agg["dominant_speaker_share"] == {"mean": 0.0, "p50": 0.0, "p90": 0.0, "max": 0.0}
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from services.vector_backends import NumpyCollection
+
+DIM = 32
+
+
+def _vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+
+
+def _upsert(coll, meeting_id: int, vecs: np.ndarray, prefix: str = "s"):
+    ids = [f"{meeting_id}:{prefix}{i}" for i in range(len(vecs))]
+    coll.upsert(ids=ids, documents=[f"doc {i}" for i in ids], embeddings=vecs.tolist(),
+                metadatas=[{"meeting_id": meeting_id, "meeting_title": f"m{meeting_id}", "segment_id": i}
+                           for i in range(len(vecs))])
+    return ids
+
+
+@pytest.fixture
+def coll(tmp_path):
+    return NumpyCollection(str(tmp_path / "coll"), block_rows=64)
+
+
+def test_delete_then_upsert_reuses_rows(coll):
+    _upsert(coll, 1, _vectors(300))
+    _upsert(coll, 2, _vectors(100, seed=1))
+    capacity = coll._capacity
+    # Reprocessing deletes a meeting's vectors and writes them back under new ids
+    for run in range(5):
+        coll.delete(where={"meeting_id": 1})
+        _upsert(coll, 1, _vectors(300, seed=run + 2), prefix=f"r{run}_")
+    assert coll.count() == 400
+    assert coll._count == 400
+    assert coll._capacity == capacity
+    hits = coll.query(query_embeddings=[_vectors(1, seed=6)[0].tolist()], n_results=5, where={"meeting_id": 1})
+    assert all(i.startswith("1:r4_") for i in hits["ids"][0])
+
+
+def test_duplicate_ids_in_one_upsert_keep_the_last(coll):
+    vecs = _vectors(3)
+    coll.upsert(ids=["a", "b", "a"], documents=["first", "b", "last"], embeddings=vecs.tolist(),
+                metadatas=[{"meeting_id": 1}] * 3)
+    assert coll.count() == 2
+    hits = coll.query(query_embeddings=[vecs[2].tolist()], n_results=1)
+    assert hits["ids"][0] == ["a"]
+    assert hits["documents"][0] == ["last"]
+    assert hits["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+
+
+def test_where_eq_is_pushed_down_to_the_sidecar(coll):
+    _upsert(coll, 1, _vectors(200))
+    _upsert(coll, 2, _vectors(200, seed=1))
+    q = _vectors(1, seed=1)[0].tolist()
+    for where in ({"meeting_id": 2}, {"meeting_id": {"$eq": 2}}, {"meeting_title": {"$eq": "m2"}}):
+        hits = coll.query(query_embeddings=[q], n_results=10, where=where)
+        assert len(hits["ids"][0]) == 10
+        assert all(md["meeting_id"] == 2 for md in hits["metadatas"][0])
+    assert coll.query(query_embeddings=[q], n_results=10, where={"meeting_id": 3})["ids"] == [[]]
+    with pytest.raises(ValueError):
+        coll.query(query_embeddings=[q], n_results=10, where={"meeting_id": {"$gt": 1}})
+
+
+@pytest.mark.parametrize("dtype,min_recall", [("float16", 0.99), ("int8", 0.9)])
+def test_quantised_recall_against_float32(tmp_path, dtype, min_recall):
+    vecs, queries, k = _vectors(2000), _vectors(50, seed=1), 10
+    exact = NumpyCollection(str(tmp_path / "f32"), block_rows=256)
+    quant = NumpyCollection(str(tmp_path / dtype), dtype=dtype, block_rows=256)
+    for c in (exact, quant):
+        _upsert(c, 1, vecs)
+    found = 0
+    for q in queries:
+        want = set(exact.query(query_embeddings=[q.tolist()], n_results=k)["ids"][0])
+        got = set(quant.query(query_embeddings=[q.tolist()], n_results=k)["ids"][0])
+        found += len(want & got)
+    assert found / (k * len(queries)) >= min_recall
+
+
+def test_second_handle_picks_up_writes(tmp_path):
+    path = str(tmp_path / "shared")
+    writer, reader = NumpyCollection(path), NumpyCollection(path)
+    assert reader.count() == 0
+    vecs = _vectors(NumpyCollection.INITIAL_CAPACITY + 10)  # forces the matrix to grow and be remapped
+    ids = _upsert(writer, 1, vecs)
+    assert reader.count() == len(vecs)
+    hits = reader.query(query_embeddings=[vecs[-1].tolist()], n_results=1)
+    assert hits["ids"][0] == [ids[-1]]
+    writer.delete(where={"meeting_id": 1})
+    assert reader.count() == 0
+    assert reader.query(query_embeddings=[vecs[-1].tolist()], n_results=1)["ids"] == [[]]